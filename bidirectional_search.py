@@ -0,0 +1,401 @@
+from sokoban import Map
+from search_methods.solver import Solver
+from search_methods.state_hash import state_key
+from search_methods.grid import DIRECTIONS, neighbour_table, label_regions
+from search_methods.process_race import race
+from array import array
+import multiprocessing
+import queue
+
+#numarul maxim de chei noi trimise deodata de procesele de cautare catre procesul principal
+BATCH_SIZE = 10000
+
+#cate stari din frontiera extinde un proces intre doua verificari ale cererilor primite
+CHUNK_SIZE = 256
+
+#etichetarile regiunilor pastrate in memorie, masurate in celule
+MAX_LABEL_CELLS = 1 << 24
+
+def pull_reachable(free, targets):
+    #celulele din care o cutie singura poate fi impinsa pe o tinta (BFS cu mutari pull din tinte)
+    seen = set(targets)
+    stack = list(targets)
+    while stack:
+        x, y = stack.pop()
+        for dx, dy in DIRECTIONS:
+            cell = (x + dx, y + dy)
+            player = (x + 2 * dx, y + 2 * dy)
+            if cell in free and player in free and cell not in seen:
+                seen.add(cell)
+                stack.append(cell)
+    return frozenset(seen)
+
+def push_reachable(free, boxes):
+    #celulele in care o cutie singura poate ajunge prin impingeri din pozitiile initiale
+    seen = set(boxes)
+    stack = list(boxes)
+    while stack:
+        x, y = stack.pop()
+        for dx, dy in DIRECTIONS:
+            behind = (x - dx, y - dy)
+            cell = (x + dx, y + dy)
+            if behind in free and cell in free and cell not in seen:
+                seen.add(cell)
+                stack.append(cell)
+    return frozenset(seen)
+
+class SearchSpace:
+    """Graful de impingeri al unei harti, cu chei (regiunea jucatorului, cutii sortate).
+
+    Regiunea jucatorului este reprezentata de celula ei minima. Regiunile
+    sunt etichetate o singura data pentru fiecare configuratie de cutii, iar
+    etichetarea este refolosita de toate starile si succesorii cu aceleasi
+    cutii. Impingerile pe celule din care cutia nu mai poate ajunge pe o tinta
+    (`live`) si mutarile pull pe celule in care nicio cutie initiala nu poate
+    ajunge (`pushable`) sunt eliminate.
+    """
+
+    def __init__(self, free, live, pushable):
+        self.free = free
+        self.live = live
+        self.pushable = pushable
+        self.cells = sorted(free)
+        self.index = {cell: i for i, cell in enumerate(self.cells)}
+        self.neighbours = neighbour_table(self.cells, self.index)
+        self.max_labels = max(1, MAX_LABEL_CELLS // max(1, len(self.cells)))
+        self.labels = {}
+
+    def __getstate__(self):
+        #etichetarile nu se trimit proceselor de cautare
+        state = dict(self.__dict__)
+        state["labels"] = {}
+        return state
+
+    def region_labels(self, boxes):
+        labels = self.labels.get(boxes)
+        if labels is None:
+            labels = array('i', label_regions(self.neighbours, {self.index[b] for b in boxes}))
+            if len(self.labels) >= self.max_labels:
+                self.labels.clear()
+            self.labels[boxes] = labels
+        return labels
+
+    def key(self, player, boxes):
+        rep = self.cells[self.region_labels(boxes)[self.index[player]]]
+        return (rep[0], rep[1], boxes)
+
+    def goal_keys(self, targets):
+        #cate o cheie pentru fiecare regiune libera din starea rezolvata
+        boxes = tuple(sorted(targets))
+        reps = sorted(set(self.region_labels(boxes)) - {-1})
+        return [(self.cells[rep][0], self.cells[rep][1], boxes) for rep in reps]
+
+    def forward_successors(self, key):
+        #impingeri: jucatorul ajunge in spatele unei cutii si o impinge o pozitie
+        rx, ry, boxes = key
+        box_set = set(boxes)
+        labels = self.region_labels(boxes)
+        rep = labels[self.index[(rx, ry)]]
+        for bx, by in boxes:
+            for dx, dy in DIRECTIONS:
+                stand = self.index.get((bx - dx, by - dy))
+                beyond = (bx + dx, by + dy)
+                if stand is None or labels[stand] != rep or beyond not in self.live or beyond in box_set:
+                    continue
+                new_boxes = tuple(sorted((box_set - {(bx, by)}) | {beyond}))
+                yield self.key((bx, by), new_boxes)
+
+    def backward_successors(self, key):
+        #inversul impingerilor: jucatorul sta langa cutie, se retrage si o trage dupa el
+        rx, ry, boxes = key
+        box_set = set(boxes)
+        labels = self.region_labels(boxes)
+        rep = labels[self.index[(rx, ry)]]
+        for bx, by in boxes:
+            for dx, dy in DIRECTIONS:
+                stand = (bx + dx, by + dy)
+                behind = (bx + 2 * dx, by + 2 * dy)
+                if stand not in self.pushable or labels[self.index[stand]] != rep:
+                    continue
+                if behind not in self.index or behind in box_set:
+                    continue
+                new_boxes = tuple(sorted((box_set - {(bx, by)}) | {stand}))
+                yield self.key(behind, new_boxes)
+
+def expand_layer(frontier, parents, successors, other_parents=None, max_states=None):
+    #extinde un strat BFS; se opreste la prima stare gasita si de cealalta parte
+    #sau cand tabela de parinti atinge max_states, chiar si in mijlocul stratului
+    next_frontier = []
+    for key in frontier:
+        for next_key in successors(key):
+            if next_key in parents:
+                continue
+            parents[next_key] = key
+            next_frontier.append(next_key)
+            if other_parents is not None and next_key in other_parents:
+                return next_frontier, next_key
+            if max_states is not None and len(parents) >= max_states:
+                return next_frontier, None
+    return next_frontier, None
+
+def chain(parents, key):
+    #cheile de la `key` pana la starea din care a pornit cautarea
+    keys = []
+    while key is not None:
+        keys.append(key)
+        key = parents[key]
+    return keys
+
+def search_worker(direction, side, space, seeds, counts, max_states, requests, results):
+    """Cautarea dintr-o directie, intr-un proces separat.
+
+    Trimite procesului principal doar cheile noi, pentru testul de
+    intersectie, si pastreaza local tabela de parinti; lantul de parinti al
+    starii de intalnire este trimis doar la cerere. `counts` contine numarul de
+    stari al fiecarei directii si dimensiunea frontierei ei (-1 dupa
+    terminare); bugetul `max_states` este comun, iar o directie cu frontiera
+    de peste doua ori mai mare decat cealalta asteapta, ca in varianta
+    secventiala in care se extinde mereu frontiera mai mica.
+    """
+    successors = getattr(space, f"{direction}_successors")
+    other = 1 - side
+    parents = {seed: None for seed in seeds}
+    frontier = list(seeds)
+    counts[side] = len(parents)
+    counts[2 + side] = len(frontier)
+    results.put(("keys", direction, list(seeds)))
+
+    def serve(timeout):
+        #raspunde la o cerere pentru lantul de parinti; True daca a primit una
+        try:
+            meeting = requests.get(timeout=timeout) if timeout else requests.get_nowait()
+        except queue.Empty:
+            return False
+        results.put(("chain", direction, chain(parents, meeting)))
+        return True
+
+    while frontier and counts[0] + counts[1] < max_states:
+        while counts[2 + other] >= 0 and len(frontier) > 2 * max(1, counts[2 + other]):
+            if serve(0.05):
+                return
+
+        next_frontier = []
+        for i in range(0, len(frontier), CHUNK_SIZE):
+            new_keys, _ = expand_layer(frontier[i:i + CHUNK_SIZE], parents, successors,
+                                       max_states=max_states - counts[other])
+            next_frontier.extend(new_keys)
+            counts[side] = len(parents)
+            for j in range(0, len(new_keys), BATCH_SIZE):
+                results.put(("keys", direction, new_keys[j:j + BATCH_SIZE]))
+            if serve(None):
+                return
+            if counts[0] + counts[1] >= max_states:
+                break
+        frontier = next_frontier
+        counts[2 + side] = len(frontier)
+
+    counts[2 + side] = -1
+    results.put(("done", direction, None))
+    #tabela de parinti ramane disponibila pana cand procesul principal cere lantul sau opreste procesul
+    while not serve(0.5):
+        pass
+
+class BidirectionalSearch(Solver):
+    """Cautare bidirectionala: inainte cu impingeri din starea initiala si
+    inapoi cu mutari de tip pull din starea rezolvata.
+
+    Starile sunt chei compacte (regiunea jucatorului, cutii sortate), deci un
+    pas in cautare este o impingere, iar deplasarile jucatorului sunt
+    reconstruite la final. Cum pozitia finala a jucatorului nu este cunoscuta,
+    cautarea inapoi porneste din fiecare regiune accesibila jucatorului in
+    starea rezolvata. Cautarile se intalnesc cand o stare apare in ambele
+    tabele de parinti. Cu `parallel=True` fiecare directie ruleaza intr-un
+    proces separat.
+    """
+
+    def __init__(self, max_states=2000000, parallel=False, verbose=False):
+        self.max_states = max_states
+        self.parallel = parallel
+        self.verbose = verbose
+        self.solution_path = []
+        self.expanded_states = 0
+        self.pull_moves_count = 0
+        self.forward_states = 0
+        self.backward_states = 0
+
+    def log(self, message):
+        if self.verbose:
+            print(message)
+
+    def free_cells(self, state):
+        return frozenset((x, y) for x in range(state.length) for y in range(state.width)
+                         if (x, y) not in state.obstacles)
+
+    def solve(self, initial_state):
+        if initial_state.is_solved():
+            return [initial_state]
+
+        if len(initial_state.targets) != len(initial_state.boxes):
+            self.log("Cautarea bidirectionala necesita acelasi numar de cutii si tinte.")
+            return None
+
+        free = self.free_cells(initial_state)
+        targets = [tuple(t) for t in initial_state.targets]
+        px, py, boxes = state_key(initial_state)
+        space = SearchSpace(free, pull_reachable(free, targets), push_reachable(free, boxes))
+
+        if any(box not in space.live for box in boxes):
+            self.log("O cutie se afla pe o celula din care nu mai poate ajunge pe nicio tinta.")
+            return None
+
+        start = space.key((px, py), boxes)
+        goals = space.goal_keys(targets)
+
+        if self.parallel:
+            keys = self.search_parallel(space, start, goals)
+        else:
+            keys = self.search(space, start, goals)
+        self.expanded_states = self.forward_states + self.backward_states
+
+        if keys is None:
+            self.log(f"Cautarile nu s-au intalnit dupa {self.expanded_states} stari.")
+            return None
+
+        self.log(f"Intalnire dupa {self.forward_states} stari inainte si {self.backward_states} inapoi.")
+        self.solution_path = self.replay(initial_state, keys, free)
+        return self.solution_path
+
+    def search(self, space, start, goals):
+        forward = {start: None}
+        backward = {goal: None for goal in goals}
+        meeting = start if start in backward else None
+
+        forward_frontier = [start]
+        backward_frontier = list(goals)
+
+        while meeting is None and forward_frontier and backward_frontier:
+            if len(forward) + len(backward) >= self.max_states:
+                break
+
+            #extindem mereu directia cu frontiera mai mica
+            if len(forward_frontier) <= len(backward_frontier):
+                forward_frontier, meeting = expand_layer(
+                    forward_frontier, forward, space.forward_successors, backward,
+                    self.max_states - len(backward))
+            else:
+                backward_frontier, meeting = expand_layer(
+                    backward_frontier, backward, space.backward_successors, forward,
+                    self.max_states - len(forward))
+
+        self.forward_states = len(forward)
+        self.backward_states = len(backward)
+        if meeting is None:
+            return None
+        return self.join_paths(chain(forward, meeting), chain(backward, meeting))
+
+    def search_parallel(self, space, start, goals):
+        results = multiprocessing.Queue()
+        requests = {"forward": multiprocessing.Queue(), "backward": multiprocessing.Queue()}
+        counts = multiprocessing.Array('q', 4, lock=False)
+        workers = [
+            multiprocessing.Process(target=search_worker, daemon=True,
+                                    args=(direction, side, space, seeds, counts, self.max_states,
+                                          requests[direction], results))
+            for side, (direction, seeds) in enumerate((("forward", [start]), ("backward", goals)))
+        ]
+
+        seen = {"forward": set(), "backward": set()}
+        other = {"forward": "backward", "backward": "forward"}
+        finished = set()
+        chains = {}
+        meeting = None
+
+        def handle(message):
+            nonlocal meeting
+            kind, direction, payload = message
+            if kind == "done":
+                finished.add(direction)
+                return meeting is None and len(finished) == 2
+            if kind == "chain":
+                chains[direction] = payload
+                return len(chains) == 2
+            if meeting is not None:
+                return False
+
+            keys = seen[direction]
+            other_keys = seen[other[direction]]
+            for key in payload:
+                keys.add(key)
+                if key in other_keys:
+                    #lanturile de parinti se cer o singura data, dupa intalnire
+                    meeting = key
+                    for inbox in requests.values():
+                        inbox.put(meeting)
+                    break
+            return False
+
+        #doar in modul paralel solverul are procese separate, deci si worker_peaks
+        self.worker_peaks = {}
+        race(workers, results, handle, poll_interval=0.5, peaks=self.worker_peaks)
+
+        self.forward_states = counts[0]
+        self.backward_states = counts[1]
+        if len(chains) < 2:
+            return None
+        return self.join_paths(chains["forward"], chains["backward"])
+
+    def join_paths(self, forward_chain, backward_chain):
+        #lantul inainte merge de la intalnire spre start, cel inapoi de la intalnire spre o stare finala
+        return list(reversed(forward_chain)) + backward_chain[1:]
+
+    def walk(self, start, goal, boxes, free):
+        #drumul cel mai scurt al jucatorului intre doua celule, ocolind cutiile
+        parents = {start: None}
+        frontier = [start]
+        while frontier and goal not in parents:
+            next_frontier = []
+            for x, y in frontier:
+                for dx, dy in DIRECTIONS:
+                    cell = (x + dx, y + dy)
+                    if cell in free and cell not in boxes and cell not in parents:
+                        parents[cell] = (x, y)
+                        next_frontier.append(cell)
+            frontier = next_frontier
+
+        cells = []
+        cell = goal
+        while cell is not None:
+            cells.append(cell)
+            cell = parents[cell]
+        cells.reverse()
+        return cells[1:]
+
+    def engine_step(self, state, expected_key):
+        #aplica mutarea normala a motorului care duce in starea asteptata
+        for move in state.filter_possible_moves():
+            if move >= 5:
+                continue
+            next_state = state.copy()
+            next_state.apply_move(move)
+            if state_key(next_state) == expected_key:
+                return next_state
+        raise RuntimeError(f"No move leads from {state_key(state)} to {expected_key}")
+
+    def replay(self, initial_state, keys, free):
+        #reconstruieste drumul ca stari Map: deplasarea pana in spatele cutiei, apoi impingerea
+        path = [initial_state]
+        state = initial_state
+        for current_key, next_key in zip(keys, keys[1:]):
+            px, py, boxes = state_key(state)
+            old_box = (set(boxes) - set(next_key[2])).pop()
+            new_box = (set(next_key[2]) - set(boxes)).pop()
+            dx, dy = new_box[0] - old_box[0], new_box[1] - old_box[1]
+            stand = (old_box[0] - dx, old_box[1] - dy)
+
+            for cell in self.walk((px, py), stand, set(boxes), free):
+                state = self.engine_step(state, (cell[0], cell[1], boxes))
+                path.append(state)
+
+            state = self.engine_step(state, (old_box[0], old_box[1], next_key[2]))
+            path.append(state)
+        return path
@@ -0,0 +1,35 @@
+DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+def flood(start, free, blocked=()):
+    #celulele accesibile din start prin celule libere, ocolind celulele blocate (de ex. cutiile)
+    seen = {start}
+    stack = [start]
+    while stack:
+        x, y = stack.pop()
+        for dx, dy in DIRECTIONS:
+            cell = (x + dx, y + dy)
+            if cell in free and cell not in seen and cell not in blocked:
+                seen.add(cell)
+                stack.append(cell)
+    return seen
+
+def neighbour_table(cells, index):
+    #pentru fiecare celula libera, indecsii vecinilor ei liberi
+    return [[index[(x + dx, y + dy)] for dx, dy in DIRECTIONS if (x + dx, y + dy) in index]
+            for x, y in cells]
+
+def label_regions(neighbours, blocked):
+    #eticheteaza fiecare celula cu indexul minim din regiunea ei (-1 pentru celulele blocate);
+    #celulele sunt parcurse in ordinea indexului, deci prima celula neetichetata este minimul regiunii
+    labels = [-1] * len(neighbours)
+    for i in range(len(neighbours)):
+        if labels[i] >= 0 or i in blocked:
+            continue
+        labels[i] = i
+        stack = [i]
+        while stack:
+            for j in neighbours[stack.pop()]:
+                if labels[j] < 0 and j not in blocked:
+                    labels[j] = i
+                    stack.append(j)
+    return labels
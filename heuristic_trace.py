@@ -0,0 +1,94 @@
+from search_methods.heuristics import (
+    min_matching_distance,
+    box_player_distance,
+    deadlock_detection,
+    pull_move_penalty,
+    distance_to_goal_state,
+    DEFAULT_WEIGHTS
+)
+import numpy as np
+
+#numele sunt cheile din DEFAULT_WEIGHTS, ca heuristica combinata sa fie calculata din ele
+TRACED_HEURISTICS = [
+    ("matching", min_matching_distance),
+    ("box_player", box_player_distance),
+    ("deadlock", deadlock_detection),
+    ("pull_penalty", pull_move_penalty),
+    ("goal_state", distance_to_goal_state),
+]
+
+TRACED_NAMES = [name for name, _ in TRACED_HEURISTICS] + ["combined"]
+
+class HeuristicTrace:
+    """Inregistrare pas cu pas a valorilor heuristicilor in timpul unei rezolvari.
+
+    Datele sunt tinute in tablouri numpy prealocate folosite ca buffere
+    circulare: dupa `capacity` inregistrari se suprascriu cele mai vechi, deci
+    nu se aloca memorie in bucla solverului. Implicit se inregistreaza doar un
+    pas din `sample_every`; la 50 costul evaluarii heuristicilor ramane sub
+    cateva procente din timpul solverului.
+    Heuristica combinata nu este reevaluata: este suma ponderata (cu
+    `weights`) a valorilor deja calculate. Solverele primesc urmarirea prin
+    parametrul `trace`; fara el, bucla lor ramane neschimbata.
+    """
+
+    def __init__(self, capacity=100000, sample_every=50, weights=None):
+        self.capacity = capacity
+        self.sample_every = max(1, sample_every)
+        self.names = list(TRACED_NAMES)
+        self.functions = [function for _, function in TRACED_HEURISTICS]
+        weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self.weights = [weights[name] for name, _ in TRACED_HEURISTICS]
+
+        self.steps = np.zeros(capacity, dtype=np.int64)
+        self.values = np.zeros((capacity, len(self.names)), dtype=np.float32)
+        self.moves = np.zeros(capacity, dtype=np.int8)
+        #mutarea propusa a fost aplicata (Simulated Annealing poate respinge mutari)
+        self.accepted = np.zeros(capacity, dtype=np.bool_)
+        self.pull_moves = np.zeros(capacity, dtype=np.bool_)
+        #temperatura pentru Simulated Annealing, h invatat pentru LRTA*
+        self.control = np.zeros(capacity, dtype=np.float32)
+        self.count = 0
+
+    def record(self, step, state, move, control, accepted=True):
+        if step % self.sample_every:
+            return
+
+        i = self.count % self.capacity
+        self.steps[i] = step
+        row = self.values[i]
+        combined = 0.0
+        for j, function in enumerate(self.functions):
+            value = function(state)
+            row[j] = value
+            combined += value * self.weights[j]
+        row[-1] = combined
+        self.moves[i] = move
+        self.accepted[i] = accepted
+        self.pull_moves[i] = accepted and move >= 5
+        self.control[i] = control
+        self.count += 1
+
+    def ordered(self, array):
+        #intoarce inregistrarile in ordine cronologica, tinand cont de suprascrieri
+        if self.count <= self.capacity:
+            return array[:self.count]
+        return np.roll(array, -(self.count % self.capacity), axis=0)
+
+    def as_dict(self):
+        return {
+            "steps": self.ordered(self.steps),
+            "values": self.ordered(self.values),
+            "moves": self.ordered(self.moves),
+            "accepted": self.ordered(self.accepted),
+            "pull_moves": self.ordered(self.pull_moves),
+            "control": self.ordered(self.control),
+            "names": np.array(self.names),
+        }
+
+    def save(self, path):
+        np.savez(path, **self.as_dict())
+
+def load_trace(path):
+    with np.load(path) as data:
+        return {key: data[key] for key in data.files}
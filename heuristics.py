@@ -1,4 +1,19 @@
 from sokoban import Map, BOX_LEFT, BOX_RIGHT, BOX_UP, BOX_DOWN
+from search_methods.pattern_database import PatternDatabase, map_hash
+from functools import partial
+import json
+import os
+
+PROFILES_DIR = "profiles"
+
+#ponderile implicite ale heuristicii combinate
+DEFAULT_WEIGHTS = {
+    "matching": 1.0,
+    "box_player": 0.5,
+    "deadlock": 1.0,
+    "pull_penalty": 0.3,
+    "goal_state": 2.0,
+}
 
 def manhattan_distance(x1, y1, x2, y2):
     return abs(x1 - x2) + abs(y1 - y2)
@@ -152,12 +167,43 @@ def distance_to_goal_state(state):
     
     return (1 - completion_percentage) * 10
 
-def combined_heuristic(state):
-    #combin mai multe functii de heuristica
-    h1 = min_matching_distance(state) * 1.0
-    h2 = box_player_distance(state) * 0.5
-    h3 = deadlock_detection(state)
-    h4 = pull_move_penalty(state) * 0.3
-    h5 = distance_to_goal_state(state) * 2.0
+_pattern_databases = {}
+
+def get_pattern_database(state, subset_size=2):
+    #o baza de date per harta, identificata dupa geometria completa (inclusiv ziduri)
+    key = (map_hash(state), subset_size)
+    if key not in _pattern_databases:
+        _pattern_databases[key] = PatternDatabase(state, subset_size)
+    return _pattern_databases[key]
+
+def pdb_max_heuristic(state):
+    #maximul valorilor exacte pe perechi de cutii din baza de date de tipare
+    return get_pattern_database(state).max_heuristic(state)
+
+def pdb_additive_heuristic(state):
+    #suma valorilor exacte pe o partitie a cutiilor in perechi disjuncte
+    return get_pattern_database(state).additive_heuristic(state)
+
+def weighted_heuristic(state, weights):
+    #combinatie liniara a heuristicilor, cu ponderile date
+    h1 = min_matching_distance(state) * weights["matching"]
+    h2 = box_player_distance(state) * weights["box_player"]
+    h3 = deadlock_detection(state) * weights["deadlock"]
+    h4 = pull_move_penalty(state) * weights["pull_penalty"]
+    h5 = distance_to_goal_state(state) * weights["goal_state"]
     
     return h1 + h2 + h3 + h4 + h5
+
+def combined_heuristic(state):
+    #combin mai multe functii de heuristica
+    return weighted_heuristic(state, DEFAULT_WEIGHTS)
+
+def make_heuristic(weights):
+    #partial (nu closure) ca heuristica sa poata fi trimisa in alte procese
+    return partial(weighted_heuristic, weights={**DEFAULT_WEIGHTS, **weights})
+
+def load_heuristic_profile(name, profiles_dir=PROFILES_DIR):
+    #incarca un profil salvat de tune_heuristics.py
+    path = name if name.endswith(".json") else os.path.join(profiles_dir, f"{name}.json")
+    with open(path) as f:
+        return json.load(f)
@@ -4,10 +4,15 @@ import random
 
 class LRTAStar(Solver):
 
-    def __init__(self, heuristic_function, max_iterations=5000, verbose=False):
+    def __init__(self, heuristic_function, max_iterations=5000, verbose=False, seed=42,
+                 pull_penalty=0.5, visit_penalty=0.2, trace=None):
         self.heuristic_function = heuristic_function
         self.max_iterations = max_iterations
         self.verbose = verbose
+        self.seed = seed
+        self.pull_penalty = pull_penalty
+        self.visit_penalty = visit_penalty
+        self.trace = trace
         self.h_table = {}
         self.visited_states = {}
         self.solution_path = []
@@ -17,12 +22,16 @@ class LRTAStar(Solver):
     def log(self, message):
         if self.verbose:
             print(message)
+    
+    def state_id(self, state):
+        #cheia folosita in h_table si visited_states
+        return str(state)
             
     def solve(self, initial_state):
         if initial_state.is_solved():
             return [initial_state]
         
-        random.seed(42)
+        random.seed(self.seed)
         
         current_state = initial_state
         self.solution_path = [current_state]
@@ -36,7 +45,7 @@ class LRTAStar(Solver):
         self.log("Inceperea algoritmului LRTA*...")
         
         while not current_state.is_solved() and iterations < self.max_iterations:
-            state_str = str(current_state)
+            state_str = self.state_id(current_state)
             
             if state_str in self.visited_states:
                 self.visited_states[state_str] += 1
@@ -59,7 +68,7 @@ class LRTAStar(Solver):
             for move in current_state.filter_possible_moves():
                 next_state = current_state.copy()
                 next_state.apply_move(move)
-                next_state_str = str(next_state)
+                next_state_str = self.state_id(next_state)
                 
                 if next_state_str in self.h_table:
                     h_value = self.h_table[next_state_str]
@@ -70,10 +79,10 @@ class LRTAStar(Solver):
                 f_value = h_value
                 
                 if move >= 5:
-                    f_value += 0.5
+                    f_value += self.pull_penalty
                 
                 if next_state_str in self.visited_states:
-                    visit_penalty = min(5, self.visited_states[next_state_str]) * 0.2
+                    visit_penalty = min(5, self.visited_states[next_state_str]) * self.visit_penalty
                     f_value += visit_penalty
                 
                 if f_value < best_f_value:
@@ -88,10 +97,13 @@ class LRTAStar(Solver):
             
             best_neighbor, move_used = random.choice(best_neighbors)
             
-            if state_str not in self.h_table:
-                self.h_table[state_str] = self.heuristic_function(current_state)
+            #valoarea nu se reciteste din tabela, care poate refuza intrari noi (tabela partajata plina)
+            if state_str in self.h_table:
+                current_h = self.h_table[state_str]
+            else:
+                current_h = self.heuristic_function(current_state)
             
-            new_h = max(self.h_table[state_str], 1 + best_f_value)
+            new_h = max(current_h, 1 + best_f_value)
             self.h_table[state_str] = new_h
             
             if move_used >= 5:
@@ -121,6 +133,9 @@ class LRTAStar(Solver):
             current_state = best_neighbor
             self.solution_path.append(current_state)
             
+            if self.trace is not None:
+                self.trace.record(iterations, current_state, move_used, new_h)
+            
             iterations += 1
             
             if iterations % 100 == 0:
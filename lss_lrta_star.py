@@ -0,0 +1,171 @@
+from sokoban import Map, moves_meaning
+from search_methods.lrta_star import LRTAStar
+import heapq
+import itertools
+import random
+
+class LSSLRTAStar(LRTAStar):
+    """LRTA* cu spatiu de cautare local (LSS-LRTA*).
+
+    La fiecare pas se face o expansiune A* limitata la `lookahead` stari in
+    jurul starii curente, se actualizeaza h pentru toata regiunea expandata
+    cu o propagare de tip Dijkstra de la frontiera si apoi agentul se muta pe
+    drumul catre cea mai buna stare de pe frontiera. Costul unei mutari pull
+    este `pull_cost`, implicit `pull_penalty` din optiunile LRTA*.
+    """
+
+    def __init__(self, heuristic_function, max_iterations=5000, verbose=False,
+                 lookahead=64, pull_cost=None, **lrta_options):
+        super().__init__(heuristic_function, max_iterations=max_iterations, verbose=verbose, **lrta_options)
+        self.lookahead = max(1, lookahead)
+        self.pull_cost = self.pull_penalty if pull_cost is None else pull_cost
+
+    def get_h(self, state_str, state):
+        if state_str not in self.h_table:
+            self.h_table[state_str] = self.heuristic_function(state)
+        return self.h_table[state_str]
+
+    def move_cost(self, move):
+        return 1 + (self.pull_cost if move >= 5 else 0)
+
+    def local_search(self, start_state):
+        #expansiune A* limitata in jurul starii curente
+        counter = itertools.count()
+        start_str = str(start_state)
+
+        states = {start_str: start_state}
+        g_values = {start_str: 0}
+        parents = {start_str: (None, None)}
+        predecessors = {}
+        closed = set()
+        open_heap = [(self.get_h(start_str, start_state), next(counter), start_str)]
+
+        while open_heap and len(closed) < self.lookahead:
+            f_value, _, state_str = heapq.heappop(open_heap)
+            if state_str in closed:
+                continue
+
+            state = states[state_str]
+            if state.is_solved():
+                return state_str, states, parents, closed, open_heap, predecessors
+
+            closed.add(state_str)
+            self.expanded_states += 1
+
+            for move in state.filter_possible_moves():
+                next_state = state.copy()
+                next_state.apply_move(move)
+                next_str = str(next_state)
+                cost = self.move_cost(move)
+
+                predecessors.setdefault(next_str, []).append((state_str, cost))
+
+                new_g = g_values[state_str] + cost
+                if next_str not in g_values or new_g < g_values[next_str]:
+                    g_values[next_str] = new_g
+                    parents[next_str] = (state_str, move)
+                    states[next_str] = next_state
+                    if next_str not in closed:
+                        heapq.heappush(open_heap, (new_g + self.get_h(next_str, next_state), next(counter), next_str))
+
+        return None, states, parents, closed, open_heap, predecessors
+
+    def update_heuristics(self, closed, open_heap, predecessors):
+        #actualizare de tip Dijkstra a valorilor h din regiunea expandata
+        for state_str in closed:
+            self.h_table[state_str] = float('inf')
+
+        frontier = set(s for _, _, s in open_heap if s not in closed)
+        heap = [(self.h_table[s], s) for s in frontier]
+        heapq.heapify(heap)
+        remaining = set(closed)
+
+        while heap and remaining:
+            h_value, state_str = heapq.heappop(heap)
+            if h_value > self.h_table[state_str]:
+                continue
+            remaining.discard(state_str)
+
+            for parent_str, cost in predecessors.get(state_str, []):
+                if parent_str in closed and self.h_table[parent_str] > cost + h_value:
+                    self.h_table[parent_str] = cost + h_value
+                    heapq.heappush(heap, (self.h_table[parent_str], parent_str))
+
+    def best_frontier_state(self, open_heap, closed, parents):
+        #starea de pe frontiera cu f minim, cu departajare aleatoare
+        best_f = float('inf')
+        candidates = []
+        for f_value, _, state_str in open_heap:
+            if state_str in closed:
+                continue
+            if f_value < best_f:
+                best_f = f_value
+                candidates = [state_str]
+            elif f_value == best_f:
+                candidates.append(state_str)
+        if not candidates:
+            return None
+        return random.choice(candidates)
+
+    def build_path(self, target_str, states, parents):
+        path = []
+        state_str = target_str
+        while parents[state_str][0] is not None:
+            parent_str, move = parents[state_str]
+            path.append((states[state_str], move))
+            state_str = parent_str
+        path.reverse()
+        return path
+
+    def solve(self, initial_state):
+        if initial_state.is_solved():
+            return [initial_state]
+
+        random.seed(self.seed)
+
+        current_state = initial_state
+        self.solution_path = [current_state]
+        iterations = 0
+
+        self.log(f"Inceperea algoritmului LSS-LRTA* (lookahead={self.lookahead})...")
+
+        while not current_state.is_solved() and iterations < self.max_iterations:
+            goal_str, states, parents, closed, open_heap, predecessors = self.local_search(current_state)
+
+            if goal_str is not None:
+                target_str = goal_str
+            else:
+                self.update_heuristics(closed, open_heap, predecessors)
+                target_str = self.best_frontier_state(open_heap, closed, parents)
+
+            if target_str is None:
+                self.log("Nu exista mutari valide disponibile. Puzzle-ul ar putea fi imposibil de rezolvat.")
+                break
+
+            for next_state, move in self.build_path(target_str, states, parents):
+                if move >= 5:
+                    self.pull_moves_count += 1
+                    self.log(f"Folosim mutare de tip pull: {moves_meaning[move]}")
+                else:
+                    self.log(f"Folosim mutare de tip push: {moves_meaning[move]}")
+
+                state_str = str(next_state)
+                self.visited_states[state_str] = self.visited_states.get(state_str, 0) + 1
+                self.solution_path.append(next_state)
+
+            current_state = self.solution_path[-1]
+            iterations += 1
+
+            if iterations % 100 == 0:
+                self.log(f"Iteratia {iterations}: Am explorat {self.expanded_states} stari, Mutari de tip pull: {self.pull_moves_count}")
+
+        if current_state.is_solved():
+            self.log(f"Solutia a fost gasita in {iterations} iteratii!")
+            self.log(f"Numarul total de stari explorate: {self.expanded_states}")
+            self.log(f"Numarul total de mutari de tip pull: {self.pull_moves_count}")
+            return self.solution_path
+        else:
+            self.log(f"Nu am gasit solutia completa in {self.max_iterations} iteratii.")
+            self.log(f"Numarul total de stari explorate: {self.expanded_states}")
+            self.log(f"Numarul total de mutari de tip pull: {self.pull_moves_count}")
+            return None
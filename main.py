@@ -1,51 +1,170 @@
 from sokoban import Map, moves_meaning
 from search_methods.lrta_star import LRTAStar
+from search_methods.lss_lrta_star import LSSLRTAStar
+from search_methods.parallel_lrta_star import ParallelLRTAStar
 from search_methods.simulated_annealing import SimulatedAnnealing
-from search_methods.heuristics import combined_heuristic
+from search_methods.bidirectional_search import BidirectionalSearch
+from search_methods.portfolio import PortfolioSolver, SOLVER_REGISTRY
+from search_methods.heuristics import combined_heuristic, load_heuristic_profile, make_heuristic
+from search_methods.path_optimizer import optimize_path
+from map_generator import generate_family, parse_int_list
+from memory_accounting import MemoryTracker, AllocationTracer, save_memory_report, MEMORY_FIELDS, TRACE_FIELDS
+from contextlib import nullcontext
 import os
 import time
 import matplotlib.pyplot as plt
 import argparse
 import numpy as np
 
-def run_single_test(algorithm, map_path):
+SOLVER_ALGORITHMS = ['lrta*', 'lss-lrta*', 'parallel-lrta*', 'simulated-annealing', 'bidirectional', 'portfolio']
+
+#algoritmul acordat de tune_heuristics.py ale carui profile le poate folosi fiecare solver
+PROFILE_ALGORITHMS = {
+    'lrta*': 'lrta*',
+    'lss-lrta*': 'lrta*',
+    'parallel-lrta*': 'lrta*',
+    'simulated-annealing': 'simulated-annealing',
+}
+
+def profile_settings(algorithm):
+    #heuristica si optiunile LRTA* din profil, doar daca profilul a fost acordat pentru acest solver;
+    #portofoliul aplica profilul fiecarui solver in parte (portfolio_settings)
+    if profile is None or algorithm == 'portfolio':
+        return combined_heuristic, {}
+    if profile.get("algorithm") != PROFILE_ALGORITHMS.get(algorithm):
+        print(f"  Warning: profile '{args.profile}' was tuned for {profile.get('algorithm')}, "
+              f"using the default heuristic for {algorithm}")
+        return combined_heuristic, {}
+    return make_heuristic(profile["weights"]), profile.get("lrta", {})
+
+def solver_options(algorithm, lrta_options):
+    #argumentele din linia de comanda si din profil ale fiecarui solver
+    if algorithm == 'lrta*':
+        return dict(lrta_options)
+    elif algorithm == 'lss-lrta*':
+        return {'lookahead': args.lookahead, **lrta_options}
+    elif algorithm == 'parallel-lrta*':
+        return {'num_agents': args.agents, **lrta_options}
+    elif algorithm == 'bidirectional':
+        return {'parallel': args.parallel_search}
+    return {}
+
+def portfolio_settings():
+    #fiecare solver din portofoliu primeste aceleasi setari ca atunci cand ruleaza singur
+    settings = {}
+    for name, (_, uses_heuristic, _) in SOLVER_REGISTRY.items():
+        heuristic, lrta_options = profile_settings(name) if uses_heuristic else (combined_heuristic, {})
+        settings[name] = (heuristic, solver_options(name, lrta_options))
+    return settings
+
+def create_solver(algorithm, heuristic, lrta_options):
+    options = solver_options(algorithm, lrta_options)
+    if algorithm == 'lrta*':
+        return LRTAStar(heuristic, verbose=False, **options)
+    elif algorithm == 'lss-lrta*':
+        return LSSLRTAStar(heuristic, verbose=False, **options)
+    elif algorithm == 'parallel-lrta*':
+        return ParallelLRTAStar(heuristic, verbose=False, **options)
+    elif algorithm == 'simulated-annealing':
+        return SimulatedAnnealing(heuristic, verbose=False, **options)
+    elif algorithm == 'bidirectional':
+        return BidirectionalSearch(verbose=False, **options)
+    elif algorithm == 'portfolio':
+        return PortfolioSolver(heuristic, verbose=False, settings=portfolio_settings())
+    else:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+
+def run_single_test(algorithm, map_path, track_memory=False):
     map_name = os.path.basename(map_path).split('.')[0]
     initial_state = Map.from_yaml(map_path)
     
     print(f"Running {algorithm} on {map_name}...")
     
-    if algorithm == 'lrta*':
-        solver = LRTAStar(combined_heuristic, verbose=False)
-    elif algorithm == 'simulated-annealing':
-        solver = SimulatedAnnealing(combined_heuristic, verbose=False)
-    else:
-        raise ValueError(f"Unknown algorithm: {algorithm}")
+    heuristic, lrta_options = profile_settings(algorithm)
     
-    start_time = time.time()
-    solution = solver.solve(initial_state)
-    end_time = time.time()
+    solver = create_solver(algorithm, heuristic, lrta_options)
+    
+    memory = MemoryTracker() if track_memory or args.memory or args.memory_trace else None
+    
+    #timpul masoara doar solve(), fara citirea si resetarea varfului RSS
+    with memory or nullcontext():
+        start_time = time.time()
+        solution = solver.solve(initial_state)
+        end_time = time.time()
     
     execution_time = end_time - start_time
+    original_path_length = len(solution) if solution else 0
+    original_pull_moves = solver.pull_moves_count if hasattr(solver, 'pull_moves_count') else 0
+    pull_moves = original_pull_moves
     
     if solution and solution[-1].is_solved():
         print(f"  Solution found in {execution_time:.4f}s")
         print(f"  States expanded: {solver.expanded_states}")
         print(f"  Pull moves: {solver.pull_moves_count}")
-        print(f"  Path length: {len(solution)}")
+        if algorithm == 'portfolio':
+            print(f"  Winner: {solver.winner} ({solver.winner_time:.4f}s)")
+        
+        if args.optimize_path:
+            solution, stats = optimize_path(solution)
+            #pull_moves si path_length descriu acelasi drum, cel optimizat
+            pull_moves = stats['pull_moves']
+            print(f"  Path length: {stats['original_length']} -> {stats['optimized_length']} "
+                  f"(loop-free: {stats['loop_free_length']})")
+            print(f"  Pull moves after optimization: {pull_moves}")
+        else:
+            print(f"  Path length: {len(solution)}")
         
         if args.output:
             save_solution(map_name, algorithm, solution)
     else:
         print(f"  Solution not found in {execution_time:.4f}s")
     
+    memory_results = {}
+    if memory:
+        memory_results = memory.record_tables(solver)
+        multiprocess = hasattr(solver, 'worker_peaks')
+        if multiprocess:
+            workers = memory_results['workers_peak_rss_mb']
+            workers_text = f"{workers:.1f} MB" if workers is not None else "unavailable"
+            print(f"  Peak RSS: {memory_results['peak_rss_mb']:.1f} MB (main process), "
+                  f"workers: {workers_text}")
+        else:
+            print(f"  Peak RSS: {memory_results['peak_rss_mb']:.1f} MB, "
+                  f"tables: {memory_results['tables_mb']:.1f} MB")
+        if not memory_results['rss_reset']:
+            print("  Warning: peak RSS could not be reset and includes earlier runs")
+        
+        #tracemalloc incetineste solverul, deci ruleaza separat si nu afecteaza execution_time;
+        #vede doar procesul principal, deci campurile raman goale pentru solverele cu procese separate
+        tracer = None
+        if args.memory_trace and multiprocess:
+            memory_results.update({field: None for field in TRACE_FIELDS})
+            print("  Tracemalloc skipped: the solver runs in separate processes")
+        elif args.memory_trace:
+            tracer = AllocationTracer(top_n=args.memory_top)
+            with tracer:
+                create_solver(algorithm, heuristic, lrta_options).solve(initial_state)
+            memory_results.update(tracer.results)
+            print(f"  Tracemalloc peak: {memory_results['tracemalloc_peak_mb']:.1f} MB "
+                  f"(traced run: {memory_results['traced_time']:.4f}s)")
+            if args.verbose:
+                print(tracer.report())
+        
+        save_memory_report(f"memory_reports/{algorithm}_{map_name}.txt", memory_results, tracer)
+    
     return {
         "map_name": map_name,
         "algorithm": algorithm,
         "solved": bool(solution and solution[-1].is_solved()),
         "execution_time": execution_time,
         "states_expanded": solver.expanded_states if hasattr(solver, 'expanded_states') else 0,
-        "pull_moves": solver.pull_moves_count if hasattr(solver, 'pull_moves_count') else 0,
-        "path_length": len(solution) if solution else 0
+        "pull_moves": pull_moves,
+        "path_length": len(solution) if solution else 0,
+        "original_path_length": original_path_length,
+        "original_pull_moves": original_pull_moves,
+        "winner": getattr(solver, 'winner', None),
+        "winner_time": getattr(solver, 'winner_time', None),
+        **memory_results
     }
 
 def run_comparison(test_maps):
@@ -104,10 +223,18 @@ def create_comparison_charts(lrta_results, sa_results):
     metrics = ["states_expanded", "pull_moves", "path_length", "execution_time"]
     metric_titles = ["Expanded states", "Pull moves", "Path length", "Execution time (s)"]
     
-    plt.figure(figsize=(15, 12))
+    if all("peak_rss_mb" in r for r in lrta_results + sa_results):
+        metrics += ["peak_rss_mb"]
+        metric_titles += ["Peak RSS (MB)"]
+    if all("tracemalloc_peak_mb" in r for r in lrta_results + sa_results):
+        metrics += ["tracemalloc_peak_mb"]
+        metric_titles += ["Peak traced memory (MB)"]
+    
+    rows = (len(metrics) + 1) // 2
+    plt.figure(figsize=(15, 6 * rows))
     
     for i, (metric, title) in enumerate(zip(metrics, metric_titles)):
-        plt.subplot(2, 2, i+1)
+        plt.subplot(rows, 2, i+1)
         
         lrta_data = []
         sa_data = []
@@ -183,7 +310,9 @@ def save_results_csv(all_results):
     
     with open('algorithm_results.csv', 'w', newline='') as csvfile:
         fieldnames = ['map_name', 'algorithm', 'solved', 'execution_time', 
-                      'states_expanded', 'pull_moves', 'path_length']
+                      'states_expanded', 'pull_moves', 'path_length', 'original_path_length',
+                      'original_pull_moves', 'winner', 'winner_time']
+        fieldnames += [f for f in MEMORY_FIELDS + TRACE_FIELDS if all(f in r for r in all_results)]
         writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
         
         writer.writeheader()
@@ -193,6 +322,69 @@ def save_results_csv(all_results):
     
     print("Results saved to algorithm_results.csv")
 
+def parse_algorithm_list(text):
+    algorithms = tuple(text.split(','))
+    unknown = [a for a in algorithms if a not in SOLVER_ALGORITHMS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown algorithms: {', '.join(unknown)}")
+    return algorithms
+
+def run_scaling_benchmark(sizes, box_counts, wall_density, seed, algorithms=('lrta*', 'simulated-annealing')):
+    print(f"Generating map family (sizes={sizes}, boxes={box_counts}, seed={seed})...")
+    maps = generate_family("generated", sizes, box_counts, wall_density, seed)
+    
+    results = []
+    for algorithm in algorithms:
+        print(f"\n=== Running {algorithm} ===")
+        for map_path in maps:
+            result = run_single_test(algorithm, map_path, track_memory=True)
+            
+            #memoria totala: procesul principal plus procesele solverului, daca exista
+            result["total_peak_rss_mb"] = result["peak_rss_mb"] + (result["workers_peak_rss_mb"] or 0)
+            size, _, rest = os.path.basename(map_path).partition('x')
+            result["size"] = int(size.split('_')[1])
+            result["boxes"] = int(rest.split('_b')[1].split('_')[0])
+            results.append(result)
+    
+    print_summary_table(results)
+    create_scaling_charts(results)
+    return results
+
+def create_scaling_charts(results):
+    metrics = ["execution_time", "states_expanded", "total_peak_rss_mb"]
+    metric_titles = ["Execution time (s)", "Expanded states", "Peak RSS (MB)"]
+    
+    plt.figure(figsize=(18, 6))
+    
+    for i, (metric, title) in enumerate(zip(metrics, metric_titles)):
+        plt.subplot(1, 3, i+1)
+        
+        for algorithm in sorted(set(r["algorithm"] for r in results)):
+            for boxes in sorted(set(r["boxes"] for r in results)):
+                runs = sorted([r for r in results if r["algorithm"] == algorithm and r["boxes"] == boxes],
+                              key=lambda r: r["size"])
+                if not runs:
+                    continue
+                
+                sizes = [r["size"] for r in runs]
+                values = [r[metric] for r in runs]
+                line, = plt.plot(sizes, values, marker='o', label=f'{algorithm}, {boxes} boxes')
+                
+                unsolved = [(r["size"], r[metric]) for r in runs if not r["solved"]]
+                if unsolved:
+                    plt.scatter(*zip(*unsolved), marker='x', color=line.get_color(), s=80)
+        
+        plt.xlabel('Map size (cells per side)')
+        plt.ylabel(title)
+        plt.title(f'{title} vs map size (x = unsolved)')
+        plt.yscale('log')
+        plt.legend(fontsize=7)
+    
+    plt.tight_layout()
+    plt.savefig("scaling_benchmark.png")
+    print("Scaling chart saved as scaling_benchmark.png")
+    plt.close()
+
 def run_heuristic_visualization(test_maps):
     from visualize_heuristics import visualize_heuristics_for_maps
     
@@ -212,13 +404,29 @@ def run_heuristic_visualization(test_maps):
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Sokoban solver using LRTA* or Simulated Annealing')
     parser.add_argument('algorithm', 
-                        choices=['lrta*', 'simulated-annealing', 'comparison', 'heuristics'], 
-                        help='The algorithm to use, comparison for both or heuristics for visualization')
+                        choices=SOLVER_ALGORITHMS + ['comparison', 'heuristics', 'scaling'], 
+                        help='The algorithm to use, comparison for both, heuristics for visualization or scaling for the generated-map benchmark')
     parser.add_argument('input', nargs='?', help='Path to the map file or "all" to test all maps')
     parser.add_argument('--output', action='store_true', help='Save solution images')
     parser.add_argument('--verbose', action='store_true', help='Show detailed steps of the solution')
+    parser.add_argument('--lookahead', type=int, default=64, help='Local search space size for lss-lrta*')
+    parser.add_argument('--optimize-path', action='store_true', help='Remove loops and shortcut the solution path')
+    parser.add_argument('--profile', default=None, help='Heuristic profile from profiles/ (see tune_heuristics.py)')
+    parser.add_argument('--agents', type=int, default=None, help='Number of agents for parallel-lrta* (default: all cores)')
+    parser.add_argument('--parallel-search', action='store_true', help='Run the bidirectional frontiers in separate processes')
+    parser.add_argument('--memory', action='store_true', help='Record peak RSS and solver table sizes')
+    parser.add_argument('--memory-trace', action='store_true',
+                        help='Also rerun each solver under tracemalloc and report its top allocation sites')
+    parser.add_argument('--memory-top', type=int, default=10, help='Number of allocation sites in the memory report')
+    parser.add_argument('--sizes', type=parse_int_list, default=(20, 50, 100, 200), help='Map sizes for scaling mode')
+    parser.add_argument('--boxes', type=parse_int_list, default=(2, 10, 30, 60), help='Box counts for scaling mode')
+    parser.add_argument('--wall-density', type=float, default=0.15, help='Interior wall density for scaling mode')
+    parser.add_argument('--seed', type=int, default=0, help='Map family seed for scaling mode')
+    parser.add_argument('--algorithms', type=parse_algorithm_list, default=('lrta*', 'simulated-annealing'),
+                        help='Comma-separated algorithms for scaling mode')
     
     args = parser.parse_args()
+    profile = load_heuristic_profile(args.profile) if args.profile else None
     
     test_maps = [
         'tests/easy_map1.yaml',
@@ -236,6 +444,8 @@ if __name__ == '__main__':
         run_comparison(test_maps)
     elif args.algorithm == 'heuristics':
         run_heuristic_visualization(test_maps)
+    elif args.algorithm == 'scaling':
+        run_scaling_benchmark(args.sizes, args.boxes, args.wall_density, args.seed, args.algorithms)
     else:
         if not args.input:
             parser.error("Input file is required in single algorithm mode")
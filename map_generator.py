@@ -0,0 +1,148 @@
+import os
+import random
+import argparse
+import yaml
+from search_methods.grid import DIRECTIONS, flood
+
+def build_grid(height, width, wall_density, rng):
+    #bordura de ziduri, ziduri interioare aleatoare, apoi pastram doar cea mai mare componenta conexa
+    free = set()
+    for x in range(1, height - 1):
+        for y in range(1, width - 1):
+            if rng.random() >= wall_density:
+                free.add((x, y))
+
+    largest = set()
+    remaining = set(free)
+    while remaining:
+        component = flood(next(iter(remaining)), free)
+        remaining -= component
+        if len(component) > len(largest):
+            largest = component
+
+    walls = [(x, y) for x in range(height) for y in range(width) if (x, y) not in largest]
+    return largest, walls
+
+def scramble_score(boxes, targets):
+    #cutii in afara tintelor, apoi distanta totala pana la cea mai apropiata tinta
+    off_target = sum(1 for box in boxes if box not in targets)
+    distance = sum(min(abs(bx - tx) + abs(by - ty) for tx, ty in targets) for bx, by in boxes)
+    return off_target * 1000 + distance
+
+def reverse_play(free, targets, rng, pull_runs):
+    """Porneste din starea rezolvata si aplica mutari de tip pull.
+
+    Fiecare pas alege o cutie si o directie in care jucatorul o poate trage si
+    o trage de un numar aleator de ori. Secventa inversata este o solutie cu
+    impingeri, deci orice stare intermediara este rezolvabila; o pastram pe
+    cea mai departata de tinte.
+    """
+    targets = set(targets)
+    boxes = set(targets)
+    start_cells = sorted(cell for cell in free if cell not in boxes)
+    player = rng.choice(start_cells)
+    best_score, best_boxes, best_player = -1, set(boxes), player
+
+    for _ in range(pull_runs):
+        reachable = flood(player, free, boxes)
+        candidates = []
+        for bx, by in boxes:
+            for dx, dy in DIRECTIONS:
+                #jucatorul sta in (bx+dx, by+dy) si se retrage in directia (dx, dy)
+                stand = (bx + dx, by + dy)
+                back = (bx + 2 * dx, by + 2 * dy)
+                if stand in reachable and back in free and back not in boxes:
+                    candidates.append(((bx, by), (dx, dy)))
+        if not candidates:
+            break
+
+        #preferam cutiile aflate inca pe tinte, ca toate cutiile sa fie amestecate
+        on_target = [c for c in candidates if c[0] in targets]
+        if on_target and rng.random() < 0.7:
+            candidates = on_target
+
+        (bx, by), (dx, dy) = rng.choice(candidates)
+        box = (bx, by)
+        for _ in range(rng.randint(1, 6)):
+            stand = (box[0] + dx, box[1] + dy)
+            back = (box[0] + 2 * dx, box[1] + 2 * dy)
+            if back not in free or back in boxes:
+                break
+            boxes.remove(box)
+            box = stand
+            boxes.add(box)
+            player = back
+
+        score = scramble_score(boxes, targets)
+        if score > best_score:
+            best_score, best_boxes, best_player = score, set(boxes), player
+
+    boxes, player = best_boxes, best_player
+    #jucatorul poate incepe oriunde in regiunea in care a ajuns
+    player = rng.choice(sorted(flood(player, free, boxes)))
+    return sorted(boxes), player
+
+def generate_map(height, width, num_boxes, wall_density=0.15, pull_runs=None, seed=None):
+    rng = random.Random(seed)
+    free, walls = build_grid(height, width, wall_density, rng)
+
+    if len(free) < 3 * num_boxes + 1:
+        raise ValueError(f"Not enough free cells ({len(free)}) for {num_boxes} boxes")
+
+    targets = rng.sample(sorted(free), num_boxes)
+    if pull_runs is None:
+        pull_runs = num_boxes * 8 + (height + width) // 4
+    boxes, player = reverse_play(free, targets, rng, pull_runs)
+
+    return {
+        "height": height,
+        "width": width,
+        "player": list(player),
+        "boxes": [list(b) for b in boxes],
+        "targets": [list(t) for t in sorted(targets)],
+        "walls": [list(w) for w in walls],
+    }
+
+def save_map(level, path):
+    with open(path, 'w') as f:
+        yaml.safe_dump(level, f, default_flow_style=None)
+
+def generate_family(out_dir, sizes=(20, 50, 100, 200), box_counts=(2, 10, 30, 60),
+                    wall_density=0.15, seed=0):
+    #o familie de harti patrate, reproductibila pentru aceeasi samanta
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for size in sizes:
+        for num_boxes in box_counts:
+            #densitatea face parte din nume, ca o alta densitate sa nu refoloseasca harti vechi
+            density = f"{wall_density:g}".replace('.', 'p')
+            path = os.path.join(out_dir, f"gen_{size}x{size}_b{num_boxes}_w{density}_s{seed}.yaml")
+            if not os.path.exists(path):
+                try:
+                    level = generate_map(size, size, num_boxes, wall_density,
+                                         seed=hash((seed, size, num_boxes)))
+                except ValueError as e:
+                    print(f"Skipping {size}x{size} with {num_boxes} boxes: {e}")
+                    continue
+                save_map(level, path)
+            paths.append(path)
+    return paths
+
+def parse_int_list(text):
+    return tuple(int(v) for v in text.split(','))
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate solvable Sokoban maps by reverse play')
+    parser.add_argument('output', help='Output directory')
+    parser.add_argument('--sizes', type=parse_int_list, default=(20, 50, 100, 200), help='Comma-separated map sizes')
+    parser.add_argument('--boxes', type=parse_int_list, default=(2, 10, 30, 60), help='Comma-separated box counts')
+    parser.add_argument('--wall-density', type=float, default=0.15, help='Probability of an interior wall')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the map family')
+
+    args = parser.parse_args()
+
+    paths = generate_family(args.output, args.sizes, args.boxes, args.wall_density, args.seed)
+    print(f"Generated {len(paths)} maps in {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+import os
+import sys
+import resource
+import time
+import tracemalloc
+from search_methods.process_race import peak_rss_mb as process_peak_rss_mb
+
+#metrici ieftine, masurate la fiecare rulare cu --memory; rss_reset arata daca
+#varful RSS a putut fi resetat, altfel peak_rss_mb include si rularile anterioare
+MEMORY_FIELDS = ['peak_rss_mb', 'rss_reset', 'workers_peak_rss_mb',
+                 'h_table_entries', 'visited_states_entries', 'tables_mb']
+
+#metrici tracemalloc, doar la cerere, dintr-o rulare separata
+TRACE_FIELDS = ['tracemalloc_peak_mb', 'allocated_blocks', 'traced_time']
+
+#tabelele solverelor a caror dimensiune este raportata
+SOLVER_TABLES = ['h_table', 'visited_states']
+
+def reset_peak_rss():
+    #pe Linux, scrierea lui "5" in clear_refs reseteaza VmHWM (varful RSS) al procesului
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+def peak_rss_mb():
+    peak = process_peak_rss_mb()
+    if peak is not None:
+        return peak
+    #ru_maxrss este in KB pe Linux si in bytes pe macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def table_size_mb(table):
+    #dimensiunea aproximativa a unui dictionar, cu tot cu chei si valori
+    if not isinstance(table, dict):
+        return 0.0
+    size = sys.getsizeof(table)
+    for key, value in table.items():
+        size += sys.getsizeof(key) + sys.getsizeof(value)
+    return size / (1024 * 1024)
+
+class MemoryTracker:
+    """Metricile ieftine de memorie ale unei rulari a unui solver.
+
+    Se foloseste ca context manager in jurul apelului `solve`. Inregistreaza
+    doar varful RSS al procesului si, prin `record_tables`, dimensiunea
+    tabelelor solverului, deci nu incetineste rularea si timpul masurat
+    ramane comparabil cu cel al rularilor fara urmarire.
+
+    Solverele care lucreaza in procese separate expun `worker_peaks` (pid ->
+    varful RSS al fiecarui proces); suma lor este raportata in
+    `workers_peak_rss_mb`, iar tabelele lor, aflate in acele procese, raman
+    necompletate.
+    """
+
+    def __init__(self):
+        self.results = {}
+
+    def __enter__(self):
+        self.results['rss_reset'] = reset_peak_rss()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.results['peak_rss_mb'] = peak_rss_mb()
+        return False
+
+    def record_tables(self, solver):
+        worker_peaks = getattr(solver, 'worker_peaks', None)
+        if worker_peaks is not None:
+            self.results['workers_peak_rss_mb'] = sum(worker_peaks.values()) if worker_peaks else None
+            for field in ['h_table_entries', 'visited_states_entries', 'tables_mb']:
+                self.results[field] = None
+            return self.results
+
+        self.results['workers_peak_rss_mb'] = None
+        tables = {name: getattr(solver, name, None) for name in SOLVER_TABLES}
+        self.results['h_table_entries'] = len(tables['h_table']) if tables['h_table'] is not None else 0
+        self.results['visited_states_entries'] = len(tables['visited_states']) if tables['visited_states'] is not None else 0
+        self.results['tables_mb'] = sum(table_size_mb(t) for t in tables.values())
+        return self.results
+
+class AllocationTracer:
+    """Urmarirea alocarilor cu tracemalloc, pentru o rulare separata.
+
+    Inregistreaza varful tracemalloc, numarul net de blocuri alocate si
+    primele `top_n` locuri din cod dupa memoria alocata. Tracemalloc
+    incetineste solverele de cateva ori, de aceea timpul rularii urmarite este
+    raportat separat, in `traced_time`, si nu inlocuieste timpul de executie.
+    Tracemalloc vede doar procesul curent, deci nu se foloseste pentru
+    solverele care lucreaza in procese separate.
+    """
+
+    def __init__(self, top_n=10, frames=1):
+        self.top_n = top_n
+        self.frames = frames
+        self.results = {}
+        self.top_allocations = []
+
+    def __enter__(self):
+        self.was_tracing = tracemalloc.is_tracing()
+        if not self.was_tracing:
+            tracemalloc.start(self.frames)
+        tracemalloc.reset_peak()
+        self.snapshot_before = tracemalloc.take_snapshot()
+        self.start_time = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        traced_time = time.time() - self.start_time
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot_after = tracemalloc.take_snapshot()
+        if not self.was_tracing:
+            tracemalloc.stop()
+
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        stats = snapshot_after.filter_traces(filters).compare_to(
+            self.snapshot_before.filter_traces(filters), 'lineno')
+
+        self.top_allocations = [
+            (str(stat.traceback), stat.size_diff / 1024, stat.count_diff)
+            for stat in stats[:self.top_n]
+        ]
+        self.snapshot_before = None
+
+        self.results = {
+            'tracemalloc_peak_mb': peak / (1024 * 1024),
+            'allocated_blocks': sum(stat.count_diff for stat in stats),
+            'traced_time': traced_time,
+        }
+        return False
+
+    def report(self):
+        lines = ["Top allocation sites (size KB, blocks):"]
+        for location, size_kb, count in self.top_allocations:
+            lines.append(f"  {location:<60} {size_kb:>10.1f} {count:>8}")
+        return "\n".join(lines)
+
+def save_memory_report(path, results, tracer=None):
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    with open(path, 'w') as f:
+        for key in MEMORY_FIELDS + TRACE_FIELDS:
+            if key in results:
+                f.write(f"{key}: {results[key]}\n")
+        if tracer is not None:
+            f.write(tracer.report() + "\n")
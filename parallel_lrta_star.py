@@ -0,0 +1,203 @@
+from sokoban import Map
+from search_methods.solver import Solver
+from search_methods.lrta_star import LRTAStar
+from search_methods.state_hash import state_key, stable_hash
+from search_methods.process_race import race
+from multiprocessing import shared_memory
+import multiprocessing
+import numpy as np
+import os
+
+class SharedHeuristicTable:
+    """Tabela h invatata, partajata intre procese prin memorie partajata.
+
+    Este o tabela de dispersie cu adresare deschisa (sondare liniara), cu chei
+    uint64 obtinute din `stable_hash` aplicat pe `state_key` si valori float64.
+    Citirile se fac fara blocare; scrierile sunt serializate printr-un lock si
+    pastreaza maximul dintre valoarea veche si cea noua, ca valorile invatate
+    sa nu scada. Peste `MAX_LOAD` din capacitate nu se mai insereaza chei noi,
+    ca sondarile sa ramana scurte; starile neinserate isi recalculeaza h.
+    Se comporta ca un dictionar, deci poate inlocui direct `LRTAStar.h_table`.
+    """
+
+    EMPTY = 0
+    MAX_LOAD = 0.7
+
+    def __init__(self, capacity=1 << 20, name=None, lock=None):
+        #capacitatea este rotunjita la o putere a lui 2
+        self.capacity = 1 << max(1, int(capacity - 1).bit_length())
+        self.mask = self.capacity - 1
+        self.max_entries = int(self.capacity * self.MAX_LOAD)
+        self.lock = lock if lock is not None else multiprocessing.Lock()
+        self.owner = name is None
+
+        #chei, valori si, la final, numarul de intrari ocupate
+        size = self.capacity * 16 + 8
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self.shm.buf[:size] = bytes(size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+
+        self.keys = np.ndarray((self.capacity,), dtype=np.uint64, buffer=self.shm.buf, offset=0)
+        self.values = np.ndarray((self.capacity,), dtype=np.float64, buffer=self.shm.buf,
+                                 offset=self.capacity * 8)
+        self.entries = np.ndarray((1,), dtype=np.int64, buffer=self.shm.buf, offset=self.capacity * 16)
+
+    def __getstate__(self):
+        return {"capacity": self.capacity, "name": self.shm.name, "lock": self.lock}
+
+    def __setstate__(self, state):
+        self.__init__(state["capacity"], name=state["name"], lock=state["lock"])
+
+    def find_slot(self, key_hash):
+        slot = key_hash & self.mask
+        for _ in range(self.capacity):
+            stored = int(self.keys[slot])
+            if stored == key_hash or stored == self.EMPTY:
+                return slot
+            slot = (slot + 1) & self.mask
+        return None
+
+    def __contains__(self, key):
+        key_hash = stable_hash(key)
+        slot = self.find_slot(key_hash)
+        return slot is not None and int(self.keys[slot]) == key_hash
+
+    def __getitem__(self, key):
+        key_hash = stable_hash(key)
+        slot = self.find_slot(key_hash)
+        if slot is None or int(self.keys[slot]) != key_hash:
+            raise KeyError(key)
+        return float(self.values[slot])
+
+    def __setitem__(self, key, value):
+        key_hash = stable_hash(key)
+        with self.lock:
+            slot = self.find_slot(key_hash)
+            if slot is None:
+                return
+            if int(self.keys[slot]) == key_hash:
+                self.values[slot] = max(float(self.values[slot]), value)
+            elif self.entries[0] < self.max_entries:
+                #valoarea se scrie inaintea cheii ca cititorii sa nu vada un slot incomplet
+                self.values[slot] = value
+                self.keys[slot] = key_hash
+                self.entries[0] += 1
+            #altfel tabela a atins incarcarea maxima: valoarea nu se memoreaza si va fi recalculata
+
+    def __len__(self):
+        return int(self.entries[0])
+
+    def close(self):
+        self.keys = None
+        self.values = None
+        self.entries = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class AgentLRTAStar(LRTAStar):
+    """Agent LRTA* care foloseste `state_key` drept cheie in tabele si isi
+    publica numarul de stari explorate intr-un contor partajat, ca munca
+    agentilor opriti inainte de final sa fie si ea numarata."""
+
+    def __init__(self, heuristic_function, agent_id, counters, **kwargs):
+        self.agent_id = agent_id
+        self.counters = counters
+        super().__init__(heuristic_function, **kwargs)
+
+    def state_id(self, state):
+        return state_key(state)
+
+    @property
+    def expanded_states(self):
+        return self.counters[self.agent_id]
+
+    @expanded_states.setter
+    def expanded_states(self, value):
+        #fiecare agent scrie doar in slotul lui, deci nu este nevoie de lock
+        self.counters[self.agent_id] = value
+
+
+def run_agent(agent_id, initial_state, heuristic_function, table, counters, max_iterations,
+              solver_options, results):
+    solver = AgentLRTAStar(heuristic_function, agent_id, counters,
+                           max_iterations=max_iterations, seed=42 + agent_id, **solver_options)
+    solver.h_table = table
+    solution = solver.solve(initial_state)
+    solved = bool(solution and solution[-1].is_solved())
+    results.put((agent_id, solution if solved else None, solver.pull_moves_count))
+
+
+class ParallelLRTAStar(Solver):
+    """Mai multi agenti LRTA* in procese separate, cu tabela h partajata.
+
+    Fiecare agent porneste din aceeasi stare initiala cu o alta samanta pentru
+    departajarea egalitatilor. Prima solutie gasita opreste toti agentii.
+    Optiunile suplimentare (de ex. `pull_penalty`) sunt trimise fiecarui agent.
+    """
+
+    def __init__(self, heuristic_function, num_agents=None, max_iterations=5000,
+                 table_capacity=1 << 20, verbose=False, **solver_options):
+        self.heuristic_function = heuristic_function
+        self.solver_options = solver_options
+        self.num_agents = num_agents or os.cpu_count() or 1
+        self.max_iterations = max_iterations
+        self.table_capacity = table_capacity
+        self.verbose = verbose
+        self.solution_path = []
+        self.expanded_states = 0
+        self.pull_moves_count = 0
+        self.winning_agent = None
+        self.learned_states = 0
+        self.worker_peaks = {}
+
+    def log(self, message):
+        if self.verbose:
+            print(message)
+
+    def solve(self, initial_state):
+        if initial_state.is_solved():
+            return [initial_state]
+
+        table = SharedHeuristicTable(self.table_capacity)
+        counters = multiprocessing.Array('q', self.num_agents, lock=False)
+        results = multiprocessing.Queue()
+        agents = [
+            multiprocessing.Process(
+                target=run_agent,
+                args=(agent_id, initial_state, self.heuristic_function, table, counters,
+                      self.max_iterations, self.solver_options, results),
+                daemon=True,
+            )
+            for agent_id in range(self.num_agents)
+        ]
+
+        solution = None
+        finished = 0
+
+        def handle(message):
+            nonlocal solution, finished
+            agent_id, path, pulls = message
+            finished += 1
+            if path is None:
+                return finished == self.num_agents
+            solution = path
+            self.winning_agent = agent_id
+            self.pull_moves_count = pulls
+            self.log(f"Agentul {agent_id} a gasit solutia!")
+            return True
+
+        self.log(f"Pornim {self.num_agents} agenti LRTA* cu tabela h partajata...")
+        try:
+            race(agents, results, handle, poll_interval=0.5, peaks=self.worker_peaks)
+        finally:
+            self.expanded_states = sum(counters)
+            self.learned_states = len(table)
+            table.close()
+
+        self.log(f"Stari invatate in tabela partajata: {self.learned_states}")
+        self.solution_path = solution if solution else [initial_state]
+        return solution
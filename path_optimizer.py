@@ -0,0 +1,95 @@
+from sokoban import Map
+from search_methods.state_hash import state_key
+from collections import deque
+
+def eliminate_loops(path):
+    #taie ciclurile: la revizitarea unei stari se renunta la tot ce a urmat dupa prima vizita
+    result = []
+    keys = []
+    positions = {}
+
+    for state in path:
+        key = state_key(state)
+        if key in positions:
+            cut = positions[key] + 1
+            for removed in keys[cut:]:
+                del positions[removed]
+            del result[cut:]
+            del keys[cut:]
+        else:
+            positions[key] = len(result)
+            result.append(state)
+            keys.append(key)
+
+    return result, positions
+
+def find_shortcut(start, start_index, positions, max_depth):
+    #BFS limitat din start; intoarce cea mai buna scurtatura catre o stare ulterioara din drum
+    best_index = start_index + 1
+    best_route = None
+    best_saving = 0
+
+    queue = deque([(start, [])])
+    seen = {state_key(start)}
+
+    while queue:
+        state, route = queue.popleft()
+        if len(route) >= max_depth:
+            continue
+
+        for move in state.filter_possible_moves():
+            next_state = state.copy()
+            next_state.apply_move(move)
+            key = state_key(next_state)
+            if key in seen:
+                continue
+            seen.add(key)
+
+            next_route = route + [next_state]
+            index = positions.get(key)
+            if index is not None and index - start_index - len(next_route) > best_saving:
+                best_saving = index - start_index - len(next_route)
+                best_index = index
+                best_route = next_route
+
+            queue.append((next_state, next_route))
+
+    return best_index, best_route
+
+def count_pull_moves(path):
+    #o mutare este pull daca o cutie ajunge pe pozitia de dinainte a jucatorului
+    pulls = 0
+    for state, next_state in zip(path, path[1:]):
+        px, py, boxes = state_key(state)
+        _, _, next_boxes = state_key(next_state)
+        if boxes != next_boxes and (px, py) in next_boxes:
+            pulls += 1
+    return pulls
+
+def optimize_path(path, max_depth=3):
+    """Scurteaza un drum de solutie: elimina ciclurile, apoi inlocuieste
+    portiuni din drum cu drumuri mai scurte gasite prin BFS de adancime
+    cel mult `max_depth`. Costul este liniar in lungimea drumului, deoarece
+    fiecare BFS are dimensiune marginita de `max_depth`.
+    """
+    original_length = len(path)
+    loop_free, positions = eliminate_loops(path)
+
+    optimized = [loop_free[0]] if loop_free else []
+    i = 0
+    while i < len(loop_free) - 1:
+        next_index, route = find_shortcut(loop_free[i], i, positions, max_depth)
+        if route is None:
+            optimized.append(loop_free[i + 1])
+            i += 1
+        else:
+            optimized.extend(route)
+            i = next_index
+
+    stats = {
+        "original_length": original_length,
+        "loop_free_length": len(loop_free),
+        "optimized_length": len(optimized),
+        "pull_moves": count_pull_moves(optimized),
+    }
+    return optimized, stats
@@ -0,0 +1,189 @@
+from sokoban import Map
+from search_methods.grid import DIRECTIONS, flood
+from collections import deque
+from itertools import combinations
+import hashlib
+import json
+import os
+import time
+import numpy as np
+
+PDB_CACHE_DIR = ".pdb_cache"
+
+#valoare pentru configuratiile din care cutiile nu mai pot ajunge pe tinte
+UNREACHABLE = np.iinfo(np.uint16).max
+
+#acelasi cost ca in deadlock_detection pentru o stare blocata
+DEADLOCK_VALUE = 1000
+
+#numarul maxim de configuratii de cutii pentru care se pastreaza etichetarea regiunilor
+MAX_CACHED_LABELS = 1 << 15
+
+def map_hash(state):
+    #hash al geometriei hartii (dimensiuni, obstacole, tinte), folosit ca cheie de cache
+    data = json.dumps([
+        state.length, state.width,
+        sorted(list(o) for o in state.obstacles),
+        sorted(list(t) for t in state.targets),
+    ])
+    return hashlib.sha1(data.encode()).hexdigest()[:16]
+
+class PatternDatabase:
+    """Baza de date de tipare pentru submultimi mici de cutii.
+
+    Pentru fiecare submultime de `subset_size` pozitii de cutii, tabela contine
+    numarul minim exact de impingeri necesar ca acele cutii sa ajunga pe tinte,
+    ignorand celelalte cutii. Valorile se calculeaza o singura data pe harta,
+    printr-un BFS retrograd cu mutari de tip pull pornind din configuratiile
+    rezolvate, si se salveaza ca tablouri numpy mapate in memorie. Durata
+    fiecarei construiri este pastrata in `build_times`.
+    """
+
+    def __init__(self, state, subset_size=2, cache_dir=PDB_CACHE_DIR):
+        self.length = state.length
+        self.width = state.width
+        self.obstacles = set(tuple(o) for o in state.obstacles)
+        self.targets = [tuple(t) for t in state.targets]
+        self.subset_size = subset_size
+        self.cache_dir = cache_dir
+        self.map_hash = map_hash(state)
+
+        self.cells = [(x, y) for x in range(self.length) for y in range(self.width)
+                      if (x, y) not in self.obstacles]
+        self.index = {cell: i for i, cell in enumerate(self.cells)}
+        self.labels = {}
+        self.build_times = {}
+
+        #tabela pentru o singura cutie acopera cutiile ramase in afara submultimilor
+        self.tables = {1: self.load_or_build(1)}
+        if 1 < subset_size <= len(set(self.targets)):
+            self.tables[subset_size] = self.load_or_build(subset_size)
+
+    def is_free(self, cell):
+        return cell in self.index
+
+    def region(self, player, boxes):
+        #reprezentantul regiunii accesibile jucatorului: celula cu indexul minim din ea
+        seen = flood(player, self.index, boxes)
+        return self.cells[min(self.index[c] for c in seen)], seen
+
+    def region_labels(self, boxes):
+        """Indexul reprezentantului regiunii fiecarei celule libere (-1 sub cutii).
+
+        O singura parcurgere eticheteaza toate regiunile unei configuratii de
+        cutii, iar rezultatul este refolosit de toate starile si succesorii cu
+        aceleasi cutii, in loc de un flood fill pentru fiecare dintre ei.
+        """
+        labels = self.labels.get(boxes)
+        if labels is not None:
+            return labels
+
+        labels = np.full(len(self.cells), -1, dtype=np.int32)
+        #celulele sunt parcurse in ordinea indexului, deci prima celula neetichetata este minimul regiunii ei
+        for i, cell in enumerate(self.cells):
+            if labels[i] >= 0 or cell in boxes:
+                continue
+            _, seen = self.region(cell, boxes)
+            labels[[self.index[c] for c in seen]] = i
+
+        if len(self.labels) >= MAX_CACHED_LABELS:
+            self.labels.clear()
+        self.labels[boxes] = labels
+        return labels
+
+    def load_or_build(self, k):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = os.path.join(self.cache_dir, f"{self.map_hash}_k{k}.npy")
+        if not os.path.exists(path):
+            self.build(k, path)
+        return np.load(path, mmap_mode='r')
+
+    def build(self, k, path):
+        start_time = time.time()
+        size = len(self.cells)
+        tmp_path = path + ".tmp.npy"
+        table = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.uint16, shape=(size,) * k)
+        table[...] = UNREACHABLE
+
+        visited = set()
+        queue = deque()
+
+        #stari initiale: cate o submultime de tinte, cu jucatorul in fiecare regiune libera
+        for goal in combinations(sorted(set(self.targets)), k):
+            boxes = frozenset(goal)
+            table[tuple(sorted(self.index[b] for b in goal))] = 0
+            for rep in np.unique(self.region_labels(boxes)):
+                if rep < 0:
+                    continue
+                visited.add((boxes, int(rep)))
+                queue.append((boxes, int(rep), 0))
+
+        while queue:
+            boxes, rep, dist = queue.popleft()
+            labels = self.region_labels(boxes)
+
+            for box in boxes:
+                bx, by = box
+                for dx, dy in DIRECTIONS:
+                    #jucatorul sta langa cutie si se indeparteaza de ea, tragand-o dupa el
+                    player = (bx + dx, by + dy)
+                    behind = (bx + 2 * dx, by + 2 * dy)
+                    if not self.is_free(player) or labels[self.index[player]] != rep:
+                        continue
+                    if not self.is_free(behind) or behind in boxes:
+                        continue
+
+                    new_boxes = (boxes - {box}) | {player}
+                    new_rep = int(self.region_labels(new_boxes)[self.index[behind]])
+                    if (new_boxes, new_rep) in visited:
+                        continue
+                    visited.add((new_boxes, new_rep))
+
+                    key = tuple(sorted(self.index[b] for b in new_boxes))
+                    if table[key] == UNREACHABLE:
+                        table[key] = dist + 1
+                    queue.append((new_boxes, new_rep, dist + 1))
+
+        table.flush()
+        del table
+        self.labels.clear()
+        os.replace(tmp_path, path)
+        self.build_times[k] = time.time() - start_time
+
+    def lookup(self, positions):
+        table = self.tables[len(positions)]
+        return int(table[tuple(sorted(self.index[p] for p in positions))])
+
+    def box_positions(self, state):
+        return [(box.x, box.y) for box in state.boxes.values()]
+
+    def max_heuristic(self, state):
+        #maximul peste toate submultimile de cutii (admisibil)
+        positions = self.box_positions(state)
+        k = min(self.subset_size, len(positions))
+        if k not in self.tables:
+            k = 1
+        value = max((self.lookup(group) for group in combinations(positions, k)), default=0)
+        return DEADLOCK_VALUE if value == UNREACHABLE else value
+
+    def additive_heuristic(self, state):
+        #suma peste o partitie disjuncta a cutiilor in submultimi (admisibila, impingerile sunt disjuncte)
+        positions = sorted(self.box_positions(state))
+        groups = []
+        k = self.subset_size
+        while len(positions) >= k and k in self.tables:
+            #grupeaza cutia curenta cu vecinii cei mai apropiati, unde interactiunile conteaza
+            first = positions.pop(0)
+            positions.sort(key=lambda p: abs(p[0] - first[0]) + abs(p[1] - first[1]))
+            group = [first] + positions[:k - 1]
+            positions = positions[k - 1:]
+            groups.append(group)
+        groups.extend([position] for position in positions)
+
+        total = 0
+        for group in groups:
+            value = self.lookup(group)
+            if value == UNREACHABLE:
+                return DEADLOCK_VALUE
+            total += value
+        return total
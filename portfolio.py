@@ -0,0 +1,114 @@
+from sokoban import Map
+from search_methods.solver import Solver
+from search_methods.lrta_star import LRTAStar
+from search_methods.lss_lrta_star import LSSLRTAStar
+from search_methods.simulated_annealing import SimulatedAnnealing
+from search_methods.bidirectional_search import BidirectionalSearch
+from search_methods.process_race import race, exit_on_terminate
+import multiprocessing
+import time
+
+#nume -> (clasa solverului, primeste heuristica?, argumente suplimentare)
+SOLVER_REGISTRY = {}
+
+def register_solver(name, solver_class, uses_heuristic=True, **kwargs):
+    #clasa si argumentele (nu o functie) ca intrarea sa poata fi trimisa altor procese
+    SOLVER_REGISTRY[name] = (solver_class, uses_heuristic, kwargs)
+
+register_solver('lrta*', LRTAStar)
+register_solver('lss-lrta*', LSSLRTAStar)
+register_solver('simulated-annealing', SimulatedAnnealing)
+register_solver('bidirectional', BidirectionalSearch, uses_heuristic=False)
+
+def build_solver(entry, heuristic_function, options=None):
+    solver_class, uses_heuristic, kwargs = entry
+    kwargs = {**kwargs, **(options or {})}
+    if uses_heuristic:
+        return solver_class(heuristic_function, **kwargs)
+    return solver_class(**kwargs)
+
+def run_entry(index, name, entry, initial_state, heuristic_function, options, counters, results):
+    exit_on_terminate()
+    solver = build_solver(entry, heuristic_function, options)
+    start_time = time.time()
+    try:
+        solution = solver.solve(initial_state)
+    finally:
+        #munca fiecarui solver, si a celor opriti inainte sa termine, ramane in counters
+        counters[2 * index] = getattr(solver, 'expanded_states', 0)
+        counters[2 * index + 1] = getattr(solver, 'pull_moves_count', 0)
+    elapsed = time.time() - start_time
+    solved = bool(solution and solution[-1].is_solved())
+    results.put((name, solution if solved else None, elapsed))
+
+class PortfolioSolver(Solver):
+    """Ruleaza simultan, in procese separate, toate solverele inregistrate.
+
+    Prima solutie gasita este intoarsa, iar celelalte procese sunt oprite
+    imediat. Castigatorul si timpul lui sunt pastrate in `winner` si
+    `winner_time`; `expanded_states` si `pull_moves_count` insumeaza munca
+    tuturor solverelor, inclusiv a celor opriti. `settings` poate da pentru
+    fiecare solver heuristica si argumentele lui (nume -> (heuristica,
+    argumente)), de exemplu cele din linia de comanda.
+
+    Procesele nu sunt daemon, ca solverele din portofoliu sa poata porni la
+    randul lor procese (de exemplu parallel-lrta*); la oprire, fiecare isi
+    opreste propriile procese.
+    """
+
+    def __init__(self, heuristic_function, solvers=None, timeout=None, verbose=False, settings=None):
+        self.heuristic_function = heuristic_function
+        self.solvers = list(solvers) if solvers else list(SOLVER_REGISTRY)
+        self.settings = settings or {}
+        self.timeout = timeout
+        self.verbose = verbose
+        self.solution_path = []
+        self.expanded_states = 0
+        self.pull_moves_count = 0
+        self.winner = None
+        self.winner_time = None
+        self.finished = {}
+        #varful RSS al fiecarui proces, pentru memory_accounting
+        self.worker_peaks = {}
+
+    def log(self, message):
+        if self.verbose:
+            print(message)
+
+    def solve(self, initial_state):
+        if initial_state.is_solved():
+            return [initial_state]
+
+        results = multiprocessing.Queue()
+        counters = multiprocessing.Array('q', 2 * len(self.solvers), lock=False)
+        workers = []
+        for index, name in enumerate(self.solvers):
+            heuristic_function, options = self.settings.get(name, (self.heuristic_function, {}))
+            workers.append(multiprocessing.Process(
+                target=run_entry,
+                args=(index, name, SOLVER_REGISTRY[name], initial_state, heuristic_function,
+                      options, counters, results)))
+        solution = None
+
+        def handle(message):
+            nonlocal solution
+            name, path, elapsed = message
+            self.finished[name] = path is not None
+            if path is None:
+                return len(self.finished) == len(workers)
+            solution = path
+            self.winner = name
+            self.winner_time = elapsed
+            self.log(f"{name} a castigat in {elapsed:.4f}s")
+            return True
+
+        start_time = time.time()
+        race(workers, results, handle, timeout=self.timeout, peaks=self.worker_peaks)
+        #race() asteapta terminarea tuturor proceselor, deci toate contoarele sunt scrise
+        self.expanded_states = sum(counters[0::2])
+        self.pull_moves_count = sum(counters[1::2])
+        if solution is None and self.timeout is not None and time.time() - start_time > self.timeout:
+            self.log("Timpul portofoliului a expirat.")
+
+        self.solution_path = solution if solution else [initial_state]
+        return solution
@@ -0,0 +1,80 @@
+import os
+import queue
+import signal
+import sys
+import time
+
+def peak_rss_mb(pid='self'):
+    #VmHWM (varful RSS) al unui proces, din /proc; None daca nu este disponibil
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+def record_peaks(processes, peaks):
+    #varful unui proces doar creste, deci pastram ultima valoare citita cat timp traieste
+    for process in processes:
+        if process.is_alive():
+            peak = peak_rss_mb(process.pid)
+            if peak is not None:
+                peaks[process.pid] = max(peak, peaks.get(process.pid, 0.0))
+
+def exit_on_terminate():
+    #terminate() trimite SIGTERM, care altfel opreste procesul fara sa ruleze blocurile finally;
+    #un proces care are la randul lui procese le opreste astfel inainte sa se termine
+    pid = os.getpid()
+
+    def stop(signum, frame):
+        if os.getpid() != pid:
+            #procesele pornite de acesta mostenesc handlerul, dar trebuie oprite imediat: altfel
+            #asteapta la iesire golirea unei cozi pe care nu o mai citeste nimeni
+            signal.signal(signum, signal.SIG_DFL)
+            os.kill(os.getpid(), signum)
+            return
+        sys.exit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+
+def race(processes, results, handle, timeout=None, poll_interval=0.1, peaks=None):
+    """Porneste procesele si trece fiecare mesaj din coada `results` la `handle`.
+
+    Cursa se opreste cand `handle` intoarce True (de exemplu la prima
+    solutie), cand toate procesele s-au terminat si coada este goala sau cand
+    expira `timeout`. Procesele ramase sunt oprite in toate cazurile, chiar si
+    la exceptii. Intoarce True daca oprirea a fost ceruta de `handle`.
+
+    Daca `peaks` este un dictionar, in el se pastreaza varful RSS al fiecarui
+    proces (pid -> MB), citit la fiecare mesaj si interval de asteptare si
+    inainte de oprirea proceselor ramase.
+    """
+    start_time = time.time()
+    try:
+        for process in processes:
+            process.start()
+
+        while True:
+            if peaks is not None:
+                record_peaks(processes, peaks)
+            if timeout is not None and time.time() - start_time > timeout:
+                return False
+            try:
+                message = results.get(timeout=poll_interval)
+            except queue.Empty:
+                if not any(process.is_alive() for process in processes) and results.empty():
+                    return False
+                continue
+            if handle(message):
+                return True
+    finally:
+        if peaks is not None:
+            record_peaks(processes, peaks)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            if process.pid is not None:
+                process.join()
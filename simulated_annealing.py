@@ -4,10 +4,76 @@ import random
 import math
 import time
 
+class AdaptiveSchedule:
+    """Program de racire care urmareste o rata de acceptare tinta.
+
+    Pe langa racirea geometrica, la fiecare fereastra de `adaptation_window`
+    iteratii temperatura este corectata spre rata de acceptare tinta, care
+    scade liniar pe parcursul bugetului restartului. Daca nu mai apare progres
+    (cutii pe tinta sau energie minima a restartului), temperatura este
+    reincalzita; dupa `max_reheats` reincalziri fara progres intre ele
+    restartul se opreste devreme.
+    """
+
+    def __init__(self, solver, budget):
+        self.solver = solver
+        self.budget = max(1, budget)
+        self.temperature = solver.initial_temperature
+        self.window_moves = 0
+        self.window_accepted = 0
+        self.iterations_since_progress = 0
+        self.reheats = 0
+
+    def target_rate(self, iteration):
+        fraction = min(1.0, iteration / self.budget)
+        return ((1 - fraction) * self.solver.target_acceptance
+                + fraction * self.solver.final_acceptance)
+
+    def step(self, iteration, accepted, improved):
+        solver = self.solver
+        self.window_moves += 1
+        if accepted:
+            self.window_accepted += 1
+        if improved:
+            self.iterations_since_progress = 0
+            self.reheats = 0
+        else:
+            self.iterations_since_progress += 1
+
+        self.temperature *= solver.cooling_rate
+
+        if self.window_moves >= solver.adaptation_window:
+            rate = self.window_accepted / self.window_moves
+            # Corectie multiplicativa: incalzim daca acceptam prea putin, racim daca acceptam prea mult
+            self.temperature *= math.exp(solver.adaptation_gain * (self.target_rate(iteration) - rate))
+            solver.acceptance_trace.append(rate)
+            solver.temperature_trace.append(self.temperature)
+            self.window_moves = 0
+            self.window_accepted = 0
+
+        self.temperature = min(max(self.temperature, solver.min_temperature), solver.initial_temperature)
+
+    def stagnated(self):
+        return self.iterations_since_progress >= self.solver.reheat_patience
+
+    def reheat(self):
+        """Reincalzeste temperatura; intoarce False cand reincalzirile s-au epuizat."""
+        if self.reheats >= self.solver.max_reheats:
+            return False
+        self.reheats += 1
+        self.solver.reheats_count += 1
+        self.temperature = max(self.temperature, self.solver.initial_temperature * self.solver.reheat_fraction)
+        self.iterations_since_progress = 0
+        return True
+
+
 class SimulatedAnnealing(Solver):
 
     def __init__(self, heuristic_function, max_iterations=20000, initial_temperature=200.0, 
-                 cooling_rate=0.998, min_temperature=0.01, verbose=False, restarts=5):
+                 cooling_rate=0.998, min_temperature=0.01, verbose=False, restarts=5,
+                 adaptive=True, target_acceptance=0.4, final_acceptance=0.02,
+                 adaptation_window=50, adaptation_gain=2.0, reheat_patience=400,
+                 reheat_fraction=0.5, max_reheats=3, seed=42, trace=None):
         self.heuristic_function = heuristic_function
         self.max_iterations = max_iterations
         self.initial_temperature = initial_temperature
@@ -15,6 +81,18 @@ class SimulatedAnnealing(Solver):
         self.min_temperature = min_temperature
         self.verbose = verbose
         self.restarts = restarts
+        self.seed = seed
+        self.trace = trace
+        
+        # Parametrii programului adaptiv de racire
+        self.adaptive = adaptive
+        self.target_acceptance = target_acceptance
+        self.final_acceptance = final_acceptance
+        self.adaptation_window = adaptation_window
+        self.adaptation_gain = adaptation_gain
+        self.reheat_patience = reheat_patience
+        self.reheat_fraction = reheat_fraction
+        self.max_reheats = max_reheats
         
         # Statistici
         self.expanded_states = 0
@@ -22,6 +100,11 @@ class SimulatedAnnealing(Solver):
         self.solution_path = []
         self.best_energy = float('inf')
         self.best_state = None
+        self.last_move = None
+        self.reheats_count = 0
+        self.early_exits = 0
+        self.acceptance_trace = []
+        self.temperature_trace = []
         
     def log(self, message):
         if self.verbose:
@@ -58,6 +141,7 @@ class SimulatedAnnealing(Solver):
             
         neighbor = state.copy()
         neighbor.apply_move(move)
+        self.last_move = move
         
         # Tin evidenta mutarilor de tip pull
         if move >= 5:
@@ -83,11 +167,14 @@ class SimulatedAnnealing(Solver):
         if initial_state.is_solved():
             return [initial_state]
             
-        random.seed(42)
+        random.seed(self.seed)
         
         best_solution = None
         best_progress = 0
         
+        # In modul adaptiv, bugetul neconsumat de un restart oprit devreme trece la restarturile urmatoare
+        remaining_iterations = self.max_iterations
+        
         # Incearca mai multe restarturi
         for restart in range(self.restarts):
             current_state = initial_state
@@ -95,16 +182,32 @@ class SimulatedAnnealing(Solver):
             current_boxes_on_target = self.count_boxes_on_target(current_state)
             temperature = self.initial_temperature
             
+            if self.adaptive:
+                budget = remaining_iterations // (self.restarts - restart)
+                schedule = AdaptiveSchedule(self, budget)
+            else:
+                budget = self.max_iterations // self.restarts
+                schedule = None
+            restart_best_boxes = current_boxes_on_target
+            restart_best_energy = current_energy
+            used_iterations = 0
+            
             # Urmarim mutarile pentru a reconstrui drumul
             path = [current_state]
             
             # Bucle principala cu mai putine iteratii pentru fiecare restart
-            for iteration in range(self.max_iterations // self.restarts):
+            for iteration in range(budget):
                 if current_state.is_solved():
                     self.log(f"Soluția a fost găsită la iterația {iteration}!")
                     return path
                     
-                if temperature < self.min_temperature:
+                if schedule is not None:
+                    if schedule.stagnated() and not schedule.reheat():
+                        self.log(f"Restartul {restart} a stagnat, opresc dupa {iteration} iteratii")
+                        self.early_exits += 1
+                        break
+                    temperature = schedule.temperature
+                elif temperature < self.min_temperature:
                     break
                     
                 # Genereaza o stare vecina
@@ -112,16 +215,24 @@ class SimulatedAnnealing(Solver):
                 
                 if neighbor is None:
                     break
+                
+                used_iterations += 1
                     
                 # Calculeaza energia si cutiile pe tinte
                 neighbor_energy = self.heuristic_function(neighbor)
                 neighbor_boxes_on_target = self.count_boxes_on_target(neighbor)
                 
                 # Decide daca acceptam solutia noua
-                if self.acceptance_probability(
+                accepted = self.acceptance_probability(
                     current_energy, neighbor_energy, temperature,
                     current_boxes_on_target, neighbor_boxes_on_target
-                ) > random.random():
+                ) > random.random()
+                
+                if self.trace is not None:
+                    self.trace.record(self.expanded_states, neighbor if accepted else current_state,
+                                      self.last_move, temperature, accepted)
+                
+                if accepted:
                     current_state = neighbor
                     current_energy = neighbor_energy
                     current_boxes_on_target = neighbor_boxes_on_target
@@ -138,8 +249,20 @@ class SimulatedAnnealing(Solver):
                         
                         if neighbor.is_solved():
                             return path
-                    
-                temperature *= self.cooling_rate
+                
+                if schedule is not None:
+                    improved = accepted and (
+                        current_boxes_on_target > restart_best_boxes or
+                        current_energy < restart_best_energy
+                    )
+                    if improved:
+                        restart_best_boxes = max(restart_best_boxes, current_boxes_on_target)
+                        restart_best_energy = min(restart_best_energy, current_energy)
+                    schedule.step(iteration, accepted, improved)
+                else:
+                    temperature *= self.cooling_rate
+                
+            remaining_iterations -= used_iterations
                 
             if current_state.is_solved():
                 return path
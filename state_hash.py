@@ -0,0 +1,13 @@
+import hashlib
+
+def state_key(state):
+    #cheie compacta a unei stari: pozitia jucatorului si pozitiile sortate ale cutiilor
+    boxes = tuple(sorted((box.x, box.y) for box in state.boxes.values()))
+    return (state.player.x, state.player.y, boxes)
+
+def stable_hash(key):
+    #hash pe 64 de biti identic in toate procesele (hash() pe str depinde de PYTHONHASHSEED)
+    data = key.encode() if isinstance(key, str) else repr(key).encode()
+    value = int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+    #valoarea 0 marcheaza un slot gol in tabelele partajate
+    return value or 1
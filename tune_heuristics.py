@@ -0,0 +1,200 @@
+import os
+import glob
+import json
+import time
+import math
+import random
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from sokoban import Map
+from search_methods.lrta_star import LRTAStar
+from search_methods.simulated_annealing import SimulatedAnnealing
+from search_methods.heuristics import DEFAULT_WEIGHTS, PROFILES_DIR, make_heuristic
+
+CACHE_DIR = ".tuning_cache"
+
+#optiunile proprii fiecarui solver, acordate impreuna cu ponderile
+DEFAULT_SOLVER_OPTIONS = {
+    "lrta*": {"pull_penalty": 0.5, "visit_penalty": 0.2},
+    "simulated-annealing": {},
+}
+
+#intervalele din care se esantioneaza fiecare pondere (scala logaritmica daca low > 0)
+SEARCH_SPACE = {
+    "matching": (0.25, 4.0),
+    "box_player": (0.0, 2.0),
+    "deadlock": (0.01, 2.0),
+    "pull_penalty": (0.0, 1.5),
+    "goal_state": (0.0, 6.0),
+}
+
+SOLVER_SEARCH_SPACE = {
+    "lrta*": {
+        "pull_penalty": (0.0, 2.0),
+        "visit_penalty": (0.0, 1.0),
+    },
+    "simulated-annealing": {},
+}
+
+def sample_values(space, rng):
+    values = {}
+    for name, (low, high) in space.items():
+        if low > 0:
+            value = math.exp(rng.uniform(math.log(low), math.log(high)))
+        else:
+            value = rng.uniform(low, high)
+        values[name] = round(value, 4)
+    return values
+
+def sample_config(algorithm, rng):
+    return {
+        "weights": sample_values(SEARCH_SPACE, rng),
+        "solver": sample_values(SOLVER_SEARCH_SPACE[algorithm], rng),
+    }
+
+def default_config(algorithm):
+    return {
+        "weights": dict(DEFAULT_WEIGHTS),
+        "solver": dict(DEFAULT_SOLVER_OPTIONS[algorithm]),
+    }
+
+def split_config(config):
+    return config["weights"], config["solver"]
+
+def map_digest(map_path):
+    #cheia cache-ului depinde de continutul hartii, nu de numele fisierului
+    with open(map_path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def cache_path(algorithm, config, map_path, seed, budget):
+    key = json.dumps([algorithm, config, map_digest(map_path), seed, budget], sort_keys=True)
+    return os.path.join(CACHE_DIR, hashlib.sha1(key.encode()).hexdigest() + ".json")
+
+def evaluate(algorithm, config, map_path, seed, budget):
+    #o singura rulare; executata in procesele din pool
+    weights, solver_options = split_config(config)
+    heuristic = make_heuristic(weights)
+    initial_state = Map.from_yaml(map_path)
+
+    if algorithm == 'lrta*':
+        solver = LRTAStar(heuristic, max_iterations=budget, seed=seed, **solver_options)
+    else:
+        solver = SimulatedAnnealing(heuristic, max_iterations=budget, seed=seed, **solver_options)
+
+    start_time = time.time()
+    solution = solver.solve(initial_state)
+    execution_time = time.time() - start_time
+
+    return {
+        "solved": bool(solution and solution[-1].is_solved()),
+        "execution_time": execution_time,
+        "states_expanded": solver.expanded_states,
+    }
+
+def evaluate_configs(pool, algorithm, configs, test_maps, seeds, budget):
+    #intoarce pentru fiecare configuratie (rata de rezolvare, timp total)
+    tasks = [(i, map_path, seed) for i in range(len(configs)) for map_path in test_maps for seed in seeds]
+    results = {}
+    pending = {}
+
+    for task in tasks:
+        i, map_path, seed = task
+        path = cache_path(algorithm, configs[i], map_path, seed, budget)
+        if os.path.exists(path):
+            with open(path) as f:
+                results[task] = json.load(f)
+        else:
+            pending[task] = pool.submit(evaluate, algorithm, configs[i], map_path, seed, budget)
+
+    for task, future in pending.items():
+        i, map_path, seed = task
+        result = future.result()
+        with open(cache_path(algorithm, configs[i], map_path, seed, budget), 'w') as f:
+            json.dump(result, f)
+        results[task] = result
+
+    print(f"  budget={budget}: {len(tasks)} runs, {len(tasks) - len(pending)} from cache")
+
+    scores = []
+    for i in range(len(configs)):
+        runs = [results[(i, m, s)] for m in test_maps for s in seeds]
+        solve_rate = sum(r["solved"] for r in runs) / len(runs)
+        total_time = sum(r["execution_time"] for r in runs)
+        scores.append((solve_rate, total_time))
+    return scores
+
+def successive_halving(algorithm, test_maps, num_configs=27, eta=3, min_budget=500,
+                       max_budget=5000, seeds=(0, 1), workers=None, rng_seed=0):
+    rng = random.Random(rng_seed)
+    configs = [default_config(algorithm)] + [sample_config(algorithm, rng) for _ in range(num_configs - 1)]
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+
+    budget = min_budget
+    scores = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            print(f"Evaluating {len(configs)} configurations...")
+            scores = evaluate_configs(pool, algorithm, configs, test_maps, seeds, budget)
+            #obiectivul: rata de rezolvare maxima, apoi timp minim
+            ranked = sorted(zip(configs, scores), key=lambda item: (-item[1][0], item[1][1]))
+            configs = [c for c, _ in ranked]
+            scores = [s for _, s in ranked]
+
+            if len(configs) == 1 or budget >= max_budget:
+                break
+            configs = configs[:max(1, len(configs) // eta)]
+            budget = min(max_budget, budget * eta)
+
+    return configs[0], scores[0], budget
+
+def save_profile(name, algorithm, config, score, budget):
+    weights, solver_options = split_config(config)
+    os.makedirs(PROFILES_DIR, exist_ok=True)
+    path = os.path.join(PROFILES_DIR, f"{name}.json")
+    profile = {
+        "name": name,
+        "algorithm": algorithm,
+        "weights": weights,
+        "solve_rate": score[0],
+        "total_time": score[1],
+        "budget": budget,
+    }
+    #optiunile solverului se salveaza doar pentru algoritmul acordat
+    if algorithm == 'lrta*':
+        profile["lrta"] = solver_options
+    with open(path, 'w') as f:
+        json.dump(profile, f, indent=2)
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(description='Tune combined_heuristic weights with successive halving')
+    parser.add_argument('--algorithm', choices=['lrta*', 'simulated-annealing'], default='lrta*')
+    parser.add_argument('--profile', default='tuned', help='Name of the profile written to profiles/')
+    parser.add_argument('--configs', type=int, default=27, help='Number of random configurations')
+    parser.add_argument('--eta', type=int, default=3, help='Fraction kept after each rung is 1/eta')
+    parser.add_argument('--min-budget', type=int, default=500, help='Solver iterations in the first rung')
+    parser.add_argument('--max-budget', type=int, default=5000, help='Solver iterations in the last rung')
+    parser.add_argument('--seeds', type=int, default=2, help='Seeds evaluated per map')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: all cores)')
+    parser.add_argument('--maps', default='tests/*.yaml', help='Glob of maps to tune on')
+
+    args = parser.parse_args()
+
+    test_maps = sorted(glob.glob(args.maps))
+    if not test_maps:
+        parser.error(f"No maps match {args.maps}")
+
+    best, score, budget = successive_halving(
+        args.algorithm, test_maps, num_configs=args.configs, eta=args.eta,
+        min_budget=args.min_budget, max_budget=args.max_budget,
+        seeds=tuple(range(args.seeds)), workers=args.workers,
+    )
+
+    path = save_profile(args.profile, args.algorithm, best, score, budget)
+    print(f"Best configuration: solve rate {score[0]:.2%}, total time {score[1]:.2f}s")
+    print(f"Profile saved to {path}")
+
+if __name__ == '__main__':
+    main()
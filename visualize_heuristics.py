@@ -13,8 +13,10 @@ from search_methods.heuristics import (
     deadlock_detection,
     pull_move_penalty,
     distance_to_goal_state,
+    pdb_additive_heuristic,
     combined_heuristic
 )
+from search_methods.heuristic_trace import HeuristicTrace, TRACED_NAMES
 
 def test_heuristic(algorithm, heuristic_func, heuristic_name, test_map_path):
     initial_state = Map.from_yaml(test_map_path)
@@ -49,6 +51,7 @@ def compare_heuristics_on_all_maps(algorithm, test_maps):
         "Deadlock": deadlock_detection,
         "Pull_Penalty": pull_move_penalty,
         "Goal_State": distance_to_goal_state,
+        "PDB": pdb_additive_heuristic,
         "Combined": combined_heuristic
     }
     
@@ -186,6 +189,93 @@ def plot_combined_performance(algorithm, aggregated_results, save_path="heuristi
     plt.savefig(f'{save_path}/{algorithm}_success_rate.png', dpi=300, bbox_inches='tight')
     plt.close()
 
+def trace_solver(algorithm, map_path, sample_every=50):
+    initial_state = Map.from_yaml(map_path)
+    trace = HeuristicTrace(sample_every=sample_every)
+    
+    if algorithm == 'lrta':
+        solver = LRTAStar(combined_heuristic, verbose=False, trace=trace)
+    else:
+        solver = SimulatedAnnealing(combined_heuristic, verbose=False, trace=trace)
+    
+    solution = solver.solve(initial_state)
+    return trace, bool(solution and solution[-1].is_solved())
+
+def plot_trace_evolution(data, algorithm, map_name, save_path):
+    names = list(data["names"])
+    control_label = "Learned h" if algorithm == 'lrta' else "Temperature"
+    
+    fig, axes = plt.subplots(len(names) + 1, 1, figsize=(12, 2.2 * (len(names) + 1)), sharex=True)
+    fig.suptitle(f'{algorithm.upper()} heuristic evolution on {map_name}', fontsize=14)
+    
+    for i, name in enumerate(names):
+        axes[i].plot(data["steps"], data["values"][:, i], linewidth=0.8)
+        pulls = data["pull_moves"]
+        axes[i].scatter(data["steps"][pulls], data["values"][pulls, i], s=4, color='#d62728', label='accepted pull move')
+        axes[i].set_ylabel(name)
+    
+    axes[0].legend(loc='upper right')
+    axes[-1].plot(data["steps"], data["control"], color='#2ca02c', linewidth=0.8)
+    axes[-1].set_ylabel(control_label)
+    axes[-1].set_xlabel('Step')
+    
+    plt.tight_layout()
+    plt.savefig(f'{save_path}/{algorithm}_{map_name}_evolution.png', dpi=150, bbox_inches='tight')
+    plt.close()
+
+def plot_trace_comparison(summary, save_path):
+    #valoarea medie a fiecarei heuristici pe harti, in ordinea dificultatii
+    names = TRACED_NAMES
+    
+    for algorithm, maps in summary.items():
+        map_names = list(maps.keys())
+        x = np.arange(len(map_names))
+        width = 0.8 / len(names)
+        
+        plt.figure(figsize=(14, 6))
+        for i, name in enumerate(names):
+            means = [maps[m]["mean_values"][i] for m in map_names]
+            plt.bar(x + i * width - 0.4 + width / 2, means, width, label=name)
+        
+        plt.yscale('symlog')
+        plt.xticks(x, map_names, rotation=45, ha='right')
+        plt.ylabel('Mean value along the trace')
+        plt.title(f'{algorithm.upper()} mean heuristic values by map (ordered by difficulty)')
+        plt.legend()
+        plt.tight_layout()
+        plt.savefig(f'{save_path}/{algorithm}_heuristic_trends.png', dpi=150, bbox_inches='tight')
+        plt.close()
+
+def visualize_heuristics_for_maps(test_maps, save_path="heuristics", sample_every=50):
+    if not os.path.exists(save_path):
+        os.makedirs(save_path)
+    
+    summary = {}
+    for algorithm in ['lrta', 'simulated_annealing']:
+        summary[algorithm] = {}
+        for map_path in test_maps:
+            map_name = os.path.basename(map_path).split('.')[0]
+            print(f"  Tracing {algorithm} on {map_name}...", end="", flush=True)
+            
+            trace, solved = trace_solver(algorithm, map_path, sample_every)
+            trace_file = f'{save_path}/{algorithm}_{map_name}.npz'
+            trace.save(trace_file)
+            data = trace.as_dict()
+            
+            if trace.count:
+                plot_trace_evolution(data, algorithm, map_name, save_path)
+            
+            summary[algorithm][map_name] = {
+                "solved": solved,
+                "steps": trace.count,
+                "trace_file": trace_file,
+                "mean_values": data["values"].mean(axis=0) if trace.count else np.zeros(len(TRACED_NAMES)),
+            }
+            print(" Solved!" if solved else " Failed to solve.")
+    
+    plot_trace_comparison(summary, save_path)
+    return summary
+
 def main():
     test_maps = [
         "tests/easy_map1.yaml",